@@ -2,11 +2,13 @@
 """The FDE Demo Runner - Demonstrates continual learning in action.
 
 Usage:
-    python run_demo.py              # Run full demo
-    python run_demo.py --reset      # Reset memory and run fresh
-    python run_demo.py --demo-mode  # Force demo mode (no API keys needed)
+    python run_demo.py                # Run full demo
+    python run_demo.py --reset        # Reset memory and run fresh
+    python run_demo.py --demo-mode    # Force demo mode (no API keys needed)
+    python run_demo.py --full-memory  # Don't truncate the memory table
 """
 
+import io
 import os
 import sys
 import time
@@ -17,6 +19,7 @@ sys.path.insert(0, os.path.dirname(__file__))
 
 from rich.console import Console
 from rich.panel import Panel
+from rich.style import Style
 from rich.text import Text
 from rich.table import Table
 
@@ -25,31 +28,91 @@ from server.events import emit_event, reset as reset_events
 
 console = Console()
 
+MEMORY_TABLE_MAX_ROWS = 50  # Cap on rows rendered in the memory table
 
-def print_banner():
+
+_STYLE_TITLE = Style(bold=True, color="cyan")
+_STYLE_DIM = Style(dim=True)
+_STYLE_ITALIC = Style(italic=True)
+_STYLE_BOLD = Style(bold=True)
+_SPONSOR_STYLES = (
+    ("Gemini", Style(color="red")),
+    ("AGI Inc", Style(color="blue")),
+    ("You.com", Style(color="green")),
+    ("Plivo", Style(color="magenta")),
+    ("Composio", Style(color="yellow")),
+)
+
+
+def _build_banner_text() -> Text:
     banner = Text()
-    banner.append("THE FDE", style="bold cyan")
-    banner.append(" - The Continual Learning Forward Deployed Engineer\n", style="dim")
-    banner.append("An autonomous agent that learns from every client interaction.\n\n", style="italic")
-    banner.append("Sponsor Stack: ", style="bold")
-    banner.append("Gemini", style="red")
-    banner.append(" | ", style="dim")
-    banner.append("AGI Inc", style="blue")
-    banner.append(" | ", style="dim")
-    banner.append("You.com", style="green")
-    banner.append(" | ", style="dim")
-    banner.append("Plivo", style="magenta")
-    banner.append(" | ", style="dim")
-    banner.append("Composio", style="yellow")
+    banner.append("THE FDE", style=_STYLE_TITLE)
+    banner.append(" - The Continual Learning Forward Deployed Engineer\n", style=_STYLE_DIM)
+    banner.append("An autonomous agent that learns from every client interaction.\n\n", style=_STYLE_ITALIC)
+    banner.append("Sponsor Stack: ", style=_STYLE_BOLD)
+    for i, (name, style) in enumerate(_SPONSOR_STYLES):
+        if i:
+            banner.append(" | ", style=_STYLE_DIM)
+        banner.append(name, style=style)
+    return banner
+
+
+# Static content, so build it once at import
+_BANNER_PANEL = Panel(
+    _build_banner_text(),
+    border_style="bold blue",
+    padding=(1, 2),
+)
+
+
+def print_banner():
+    console.print(_BANNER_PANEL)
+
+
+def _flush_renderable(renderable) -> None:
+    """Render to an in-memory buffer, then write it to stdout in one call."""
+    buf = io.StringIO()
+    tmp = Console(
+        file=buf,
+        force_terminal=console.is_terminal,
+        color_system=console.color_system,
+        width=console.size.width,
+    )
+    tmp.print(renderable)
+    sys.stdout.write(buf.getvalue())
+    sys.stdout.flush()
+
+
+def _deployed_text(deployed: bool) -> Text:
+    """Styled Yes/No cell, built without going through the markup parser."""
+    return Text("Yes", style="green") if deployed else Text("No", style="red")
 
-    console.print(Panel(
-        banner,
-        border_style="bold blue",
-        padding=(1, 2),
-    ))
 
+def _show_memory(agent, max_rows: int | None = MEMORY_TABLE_MAX_ROWS) -> None:
+    """Display the contents of the agent's vector memory.
 
-def run_demo(reset: bool = False):
+    At most ``max_rows`` mappings are rendered; pass None to show them all.
+    """
+    if agent.memory.count == 0:
+        console.print("[dim]Memory empty[/dim]")
+        return
+
+    all_mappings = agent.memory.get_all_mappings()
+    shown = all_mappings if max_rows is None else all_mappings[:max_rows]
+
+    table = Table(title="Vector Memory Contents")
+    table.add_column("Source Column", style="cyan")
+    table.add_column("Target Field", style="green")
+    table.add_column("Learned From", style="dim")
+    for m in shown:
+        table.add_row(m["source_column"], m["target_field"], m["client_name"])
+    hidden = len(all_mappings) - len(shown)
+    if hidden > 0:
+        table.add_row(f"… +{hidden} more", "", "", style="dim")
+    _flush_renderable(table)
+
+
+def run_demo(reset: bool = False, full_memory: bool = False):
     from src.agent import FDEAgent
 
     agent = FDEAgent()
@@ -86,14 +149,7 @@ def run_demo(reset: bool = False):
     # Show what was learned
     console.print()
     console.print("[bold yellow]What the agent learned from Client A:[/bold yellow]")
-    all_mappings = agent.memory.get_all_mappings()
-    table = Table(title="Vector Memory Contents")
-    table.add_column("Source Column", style="cyan")
-    table.add_column("Target Field", style="green")
-    table.add_column("Learned From", style="dim")
-    for m in all_mappings:
-        table.add_row(m["source_column"], m["target_field"], m["client_name"])
-    console.print(table)
+    _show_memory(agent, max_rows=None if full_memory else MEMORY_TABLE_MAX_ROWS)
 
     # ============================================================
     # PHASE 2: THE EXPERT (Day 2 - Client B)
@@ -120,7 +176,7 @@ def run_demo(reset: bool = False):
     # FINAL COMPARISON
     # ============================================================
     console.print()
-    comparison = Table(title="Learning Comparison: Novice vs Expert", show_lines=True)
+    comparison = Table(title="Learning Comparison: Novice vs Expert")
     comparison.add_column("Metric", style="bold")
     comparison.add_column("Client A (Novice)", justify="center", style="yellow")
     comparison.add_column("Client B (Expert)", justify="center", style="green")
@@ -132,11 +188,11 @@ def run_demo(reset: bool = False):
     comparison.add_row("New Learnings", str(summary_a["new_learnings"]), str(summary_b["new_learnings"]))
     comparison.add_row(
         "Deployed",
-        "[green]Yes[/green]" if summary_a["deployed"] else "[red]No[/red]",
-        "[green]Yes[/green]" if summary_b["deployed"] else "[red]No[/red]",
+        _deployed_text(summary_a["deployed"]),
+        _deployed_text(summary_b["deployed"]),
     )
 
-    console.print(comparison)
+    _flush_renderable(comparison)
 
     # Final message
     console.print()
@@ -158,13 +214,14 @@ def main():
     parser = argparse.ArgumentParser(description="The FDE Demo")
     parser.add_argument("--reset", action="store_true", help="Reset memory before demo")
     parser.add_argument("--demo-mode", action="store_true", help="Force demo mode (no API keys)")
+    parser.add_argument("--full-memory", action="store_true", help="Show every learned mapping in the memory table")
     args = parser.parse_args()
 
     if args.demo_mode:
         os.environ["DEMO_MODE"] = "true"
 
     print_banner()
-    run_demo(reset=args.reset)
+    run_demo(reset=args.reset, full_memory=args.full_memory)
 
 
 if __name__ == "__main__":
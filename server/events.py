@@ -1,78 +1,146 @@
 """Event bus for bridging agent pipeline events to the live dashboard via SSE.
 
-Uses a module-level queue pattern (same as teacher.py shared state).
-The agent calls emit_event() at each pipeline step, and the SSE endpoint
-streams events to connected dashboard clients.
+Uses module-level shared state (same pattern as teacher.py). The agent
+calls emit_event() at each pipeline step, and the SSE endpoint streams
+events to connected dashboard clients.
 """
 
+import itertools
 import json
-import queue
 import threading
 import time
+from collections import deque
 
-# Module-level state
-_subscribers: list[queue.Queue] = []
-_subscribers_lock = threading.Lock()
-_event_history: list[dict] = []
-_history_lock = threading.Lock()
+MAX_HISTORY = 1024  # Events kept in the ring for replay and slow readers
+
+# Module-level state. Every event goes into one ring buffer, tagged with a
+# monotonically increasing id. Subscribers don't get their own queues: each
+# keeps a cursor (the last id it has seen) and reads whatever is newer,
+# waiting on _events_cond when caught up. Ids keep counting across reset()
+# so existing cursors stay valid.
+_events: deque[tuple[int, dict, bytes]] = deque(maxlen=MAX_HISTORY)
+_last_id = 0
+_subscriber_count = 0
+_events_cond = threading.Condition()
+
+# json.dumps() builds a new JSONEncoder on every call that passes options,
+# so keep one compact encoder around instead.
+_encode_json = json.JSONEncoder(separators=(",", ":")).encode
 
 
 def emit_event(event_type: str, data: dict | None = None) -> None:
     """Emit an event from the agent pipeline to all SSE subscribers.
 
+    The event is encoded into its SSE frame bytes once here; every subscriber
+    and history replay writes those bytes as-is. Emitting costs one append
+    and one notify regardless of how many clients are connected.
+
     Args:
         event_type: e.g. 'step_start', 'mapping_result', 'phone_call'
         data: arbitrary JSON-serializable payload
     """
+    global _last_id
     event = {
         "type": event_type,
         "data": data or {},
         "timestamp": time.time(),
     }
+    payload = format_sse(event).encode("utf-8")
+
+    with _events_cond:
+        _last_id += 1
+        _events.append((_last_id, event, payload))
+        _events_cond.notify_all()
 
-    # Store in history
-    with _history_lock:
-        _event_history.append(event)
 
-    # Push to all subscribers
-    with _subscribers_lock:
-        dead = []
-        for q in _subscribers:
-            try:
-                q.put_nowait(event)
-            except queue.Full:
-                dead.append(q)
-        for q in dead:
-            _subscribers.remove(q)
+def emit_events_batch(events: list[tuple[str, dict | None]]) -> None:
+    """Emit several (event_type, data) events in order with one wakeup.
+
+    Same result as calling emit_event() for each, but subscribers are
+    notified once and see the whole batch together.
+    """
+    global _last_id
+    now = time.time()
+    encoded = []
+    for event_type, data in events:
+        event = {"type": event_type, "data": data or {}, "timestamp": now}
+        encoded.append((event, format_sse(event).encode("utf-8")))
+    if not encoded:
+        return
+
+    with _events_cond:
+        for event, payload in encoded:
+            _last_id += 1
+            _events.append((_last_id, event, payload))
+        _events_cond.notify_all()
+
+
+def subscribe(limit: int | None = None) -> int | None:
+    """Register a subscriber and return its starting cursor.
+
+    The cursor sits before the retained history, so the first read_events()
+    call replays it. If ``limit`` subscribers are already registered, nothing
+    is registered and None is returned; the check and the registration
+    happen under one lock, so concurrent callers can't overshoot it.
+    """
+    global _subscriber_count
+    with _events_cond:
+        if limit is not None and _subscriber_count >= limit:
+            return None
+        _subscriber_count += 1
+        return _events[0][0] - 1 if _events else _last_id
 
 
-def subscribe() -> queue.Queue:
-    """Create a new subscriber queue. Returns it for reading events."""
-    q = queue.Queue(maxsize=256)
-    with _subscribers_lock:
-        _subscribers.append(q)
-    return q
+def unsubscribe() -> None:
+    """Unregister a subscriber added with subscribe()."""
+    global _subscriber_count
+    with _events_cond:
+        _subscriber_count -= 1
 
 
-def unsubscribe(q: queue.Queue) -> None:
-    """Remove a subscriber queue."""
-    with _subscribers_lock:
-        if q in _subscribers:
-            _subscribers.remove(q)
+def subscriber_count() -> int:
+    """Number of currently connected subscribers."""
+    return _subscriber_count
+
+
+def read_events(cursor: int, timeout: float = 0) -> tuple[int, list[bytes]]:
+    """Return (new_cursor, payloads) for the events after ``cursor``.
+
+    Waits up to ``timeout`` seconds for something new and returns an empty
+    list if nothing arrives. A reader that has fallen more than MAX_HISTORY
+    events behind resumes at the oldest retained event. After reset() the
+    cleared events can't be read, so a cursor behind them moves up to the
+    latest id and waits for the next event like any caught-up reader.
+    """
+    with _events_cond:
+        if not _events:
+            cursor = max(cursor, _last_id)
+        if _last_id <= cursor and timeout > 0:
+            _events_cond.wait_for(lambda: _last_id > cursor, timeout)
+        if not _events:
+            return max(cursor, _last_id), []
+        if _last_id <= cursor:
+            return cursor, []
+        skip = max(cursor - _events[0][0] + 1, 0)
+        payloads = [payload for _, _, payload in itertools.islice(_events, skip, None)]
+        return _last_id, payloads
 
 
 def get_history() -> list[dict]:
-    """Return all events emitted so far (for late-joining clients)."""
-    with _history_lock:
-        return list(_event_history)
+    """Return the most recent events (for late-joining clients).
+
+    Only the last MAX_HISTORY events are retained.
+    """
+    with _events_cond:
+        return [event for _, event, _ in _events]
 
 
 def reset() -> None:
     """Clear event history for demo restart."""
-    with _history_lock:
-        _event_history.clear()
+    with _events_cond:
+        _events.clear()
 
 
 def format_sse(event: dict) -> str:
     """Format an event as an SSE message string."""
-    return f"data: {json.dumps(event)}\n\n"
+    return f"data: {_encode_json(event)}\n\n"
@@ -192,10 +192,18 @@ function switchTab(tab) {
     };
 
     // ── SSE Connection ─────────────────────────────────
+    // EventSource reconnects by itself after a dropped stream, but gives up
+    // for good on a non-200 reply (e.g. a proxy error). Then we reconnect
+    // ourselves, backing off from 1s up to 30s.
+    const RECONNECT_MIN_MS = 1000;
+    const RECONNECT_MAX_MS = 30000;
+    let reconnectDelay = RECONNECT_MIN_MS;
+
     function connect() {
         const evtSource = new EventSource("/dashboard/events");
 
         evtSource.onopen = function () {
+            reconnectDelay = RECONNECT_MIN_MS;
             state.connected = true;
             dom.liveBadge.classList.add("connected");
             dom.liveBadge.querySelector(".live-text").textContent = "LIVE";
@@ -215,6 +223,10 @@ function switchTab(tab) {
             state.connected = false;
             dom.liveBadge.classList.remove("connected");
             dom.liveBadge.querySelector(".live-text").textContent = "DISCONNECTED";
+            if (evtSource.readyState === EventSource.CLOSED) {
+                setTimeout(connect, reconnectDelay);
+                reconnectDelay = Math.min(reconnectDelay * 2, RECONNECT_MAX_MS);
+            }
         };
     }
 
@@ -13,7 +13,10 @@ Routes:
 """
 
 import csv
-import io
+import functools
+import gzip
+import hashlib
+import logging
 import os
 import re
 import sys
@@ -22,121 +25,208 @@ import time
 # Ensure project root is in path when running as script
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from flask import Flask, request, Response, render_template, redirect, url_for
+from flask import Flask, request, Response, redirect, url_for, send_file
 from plivo import plivoxml
 
 import threading
+from types import MappingProxyType
+from urllib.parse import urlencode
+from xml.sax.saxutils import escape
 
+from src.agent import FDEAgent, load_target_schema
+from src.browser import csv_row_dict
 from src.teacher import get_call_session, set_mapping_response, mark_session_complete
-from server.events import emit_event, subscribe, unsubscribe, get_history, format_sse, reset as reset_events
+from server.events import (
+    emit_event, subscribe, unsubscribe, read_events, reset as reset_events,
+)
 from src.config import Config
 
-# Track demo state
-_demo_running = False
+# Held for the whole of a demo run; acquire(blocking=False) is the
+# test-and-set that enforces one run at a time.
 _demo_lock = threading.Lock()
 
+# Shared agent, built on first use and reused across demo runs
+_agent = None
+_agent_lock = threading.Lock()
+
+_SERVER_DIR = os.path.dirname(__file__)
+
 app = Flask(
     __name__,
-    template_folder=os.path.join(os.path.dirname(__file__), "templates"),
-    static_folder=os.path.join(os.path.dirname(__file__), "static"),
+    template_folder=os.path.join(_SERVER_DIR, "templates"),
+    static_folder=os.path.join(_SERVER_DIR, "static"),
 )
+# JSON responses are small fixed-shape dicts; don't sort their keys on every dump
+app.json.sort_keys = False
 
 # ── Portal Configuration ────────────────────────────────
 
-PORTAL_CONFIGS = {
-    "acme": {
+# Read-only: _CSV_PATHS and the page caches below are derived from it at import
+PORTAL_CONFIGS = MappingProxyType({
+    "acme": MappingProxyType({
         "client_name": "Acme Corp",
         "primary_color": "#003366",
         "csv_file": "client_a_acme.csv",
-    },
-    "globex": {
+    }),
+    "globex": MappingProxyType({
         "client_name": "Globex Inc",
         "primary_color": "#336633",
         "csv_file": "client_b_globex.csv",
-    },
-}
+    }),
+})
 
+_DATA_DIR = os.path.join(os.path.dirname(_SERVER_DIR), "data", "mock")
+_CSV_PATHS = {key: os.path.join(_DATA_DIR, cfg["csv_file"]) for key, cfg in PORTAL_CONFIGS.items()}
 
-def _load_csv(client_key: str) -> tuple[list[str], list[dict], str]:
-    """Load CSV data for a portal client. Returns (columns, rows, raw_csv)."""
-    config = PORTAL_CONFIGS.get(client_key)
-    if not config:
-        return [], [], ""
-    csv_path = os.path.join(
-        os.path.dirname(os.path.dirname(__file__)), "data", "mock", config["csv_file"]
-    )
-    with open(csv_path, "r") as f:
-        raw_csv = f.read()
-    reader = csv.DictReader(io.StringIO(raw_csv))
-    columns = reader.fieldnames or []
-    rows = list(reader)
-    return columns, rows, raw_csv
+
+_DASHBOARD_MAX_ROWS = 200  # Rows kept for the portal table; the rest are only counted
+
+# Parsed CSVs keyed by client: (mtime_ns, columns, rows, row_count)
+_csv_cache: dict[str, tuple[int, tuple[str, ...], tuple[dict, ...], int]] = {}
+_csv_cache_lock = threading.Lock()
+
+
+def _csv_path(client_key: str) -> str | None:
+    """Return the absolute path of a portal client's CSV file, or None."""
+    return _CSV_PATHS.get(client_key)
+
+
+def _with_portal(view):
+    """Look up the client's portal config, or 404 before calling the view.
+
+    The wrapped view is called as view(config, client_key).
+    """
+    @functools.wraps(view)
+    def wrapper(client_key):
+        config = PORTAL_CONFIGS.get(client_key)
+        if config is None:
+            return "Unknown client portal", 404
+        return view(config, client_key)
+    return wrapper
+
+
+def _load_csv(client_key: str) -> tuple[int, tuple[str, ...], tuple[dict, ...], int]:
+    """Load CSV data for a portal client. Returns (mtime_ns, columns, rows, row_count).
+
+    Only the first _DASHBOARD_MAX_ROWS records become row dicts; the rest
+    are counted in the same pass. Parsed results are cached and re-read only
+    when the file's mtime changes. They are shared between requests, so
+    callers must not mutate the row dicts. The mtime is the one these rows
+    were parsed under, so callers can key derived caches on it.
+    """
+    csv_path = _csv_path(client_key)
+    if not csv_path:
+        return 0, (), (), 0
+    mtime = os.stat(csv_path).st_mtime_ns
+    cached = _csv_cache.get(client_key)
+    if cached and cached[0] == mtime:
+        return cached
+
+    with _csv_cache_lock:
+        # Another request may have parsed it while we waited for the lock
+        cached = _csv_cache.get(client_key)
+        if cached and cached[0] == mtime:
+            return cached
+
+        # Parse straight from the file; no full-text copy is kept around
+        with open(csv_path, "r", newline="") as f:
+            reader = csv.reader(f)
+            columns = tuple(next(reader, ()))
+            n = len(columns)
+            rows = []
+            row_count = 0
+            for record in reader:
+                if not record:
+                    continue
+                if row_count < _DASHBOARD_MAX_ROWS:
+                    # Short or long rows are filled in as csv.DictReader would
+                    rows.append(
+                        dict(zip(columns, record)) if len(record) == n
+                        else csv_row_dict(columns, record)
+                    )
+                row_count += 1
+        cached = (mtime, columns, tuple(rows), row_count)
+        _csv_cache[client_key] = cached
+    return cached
 
 
 # ── Speech Parsing Helpers ──────────────────────────────
 
-_CONFIRM_WORDS = {"yes", "yeah", "yep", "correct", "right", "confirmed", "affirmative", "sure", "okay"}
-_REJECT_WORDS = {"no", "nope", "wrong", "incorrect", "negative", "reject"}
+_CONFIRM_WORDS = frozenset({"yes", "yeah", "yep", "correct", "right", "confirmed", "affirmative", "sure", "okay"})
+_REJECT_WORDS = frozenset({"no", "nope", "wrong", "incorrect", "negative", "reject"})
+
+# Extracts a corrected field name from speech. Searching (not matching)
+# also covers "no, it's ...", "nope, use ..." and "wrong, it should be ...".
+_CORRECTION_RE = re.compile(r"(?:should be|change to|map to|it's|it is|use|make it|that's)\s+(.+)")
+_FILLER_WORDS_RE = re.compile(r"\b(the|a|an|field|column)\b")
+_WHITESPACE_RE = re.compile(r"\s+")
+# Punctuation that separates words in a spoken reply, mapped to spaces
+_PUNCT_TO_SPACE = str.maketrans(",.-!?", "     ")
+
 
-# Patterns for extracting a corrected field name from speech
-_CORRECTION_PATTERNS = [
-    r"(?:should be|change to|map to|it's|it is|use|make it|that's)\s+(.+)",
-    r"(?:no|nope|wrong)[,.\s]+(?:it's|it should be|use|map to|that's)\s+(.+)",
-]
+@functools.lru_cache(maxsize=64)
+def _field_index(
+    fields: tuple[str, ...],
+) -> tuple[tuple[str, ...], tuple[str, ...], dict[str, int]]:
+    """Normalized forms of a target field list, computed once per list.
+
+    Returns (lowercased, lowercased with underscores as spaces, exact) where
+    ``exact`` maps either form to the index of the first field that has it.
+    """
+    lows = tuple(f.lower() for f in fields)
+    spaced = tuple(low.replace("_", " ") for low in lows)
+    exact: dict[str, int] = {}
+    for i, (low, space) in enumerate(zip(lows, spaced)):
+        exact.setdefault(low, i)
+        exact.setdefault(space, i)
+    return lows, spaced, exact
 
 
-def _extract_field_from_speech(text: str, target_fields: list[str]) -> str | None:
+def _extract_field_from_speech(text_lower: str, target_fields: list[str]) -> str | None:
     """Fuzzy-match a target field name from spoken text.
 
+    ``text_lower`` must already be lowercased and stripped, as
+    _parse_human_response prepares it.
+
     Handles:
     - Exact match: "email"
     - Underscores as spaces: "email address" -> "email_address"
     - Substring match: "the email field" -> "email"
     - Correction phrases: "should be email_address" -> "email_address"
     """
-    if not text or not target_fields:
+    if not text_lower or not target_fields:
         return None
 
-    text_lower = text.lower().strip()
-
     # Try extracting the field name from correction phrases first
     candidate = text_lower
-    for pattern in _CORRECTION_PATTERNS:
-        match = re.search(pattern, text_lower)
-        if match:
-            candidate = match.group(1).strip().rstrip(".")
-            break
+    match = _CORRECTION_RE.search(text_lower)
+    if match:
+        candidate = match.group(1).strip().rstrip(".")
 
     # Clean up: remove articles, extra spaces
-    candidate = re.sub(r"\b(the|a|an|field|column)\b", "", candidate).strip()
-    candidate = re.sub(r"\s+", " ", candidate)
-
-    # Build lookup: field name -> normalized forms
-    for field_name in target_fields:
-        field_lower = field_name.lower()
-        # Exact match
-        if candidate == field_lower:
-            return field_name
-        # Underscore-as-space match: "email address" matches "email_address"
-        if candidate == field_lower.replace("_", " "):
-            return field_name
-        # Space-as-underscore: "email_address" matches "email_address"
-        if candidate.replace(" ", "_") == field_lower:
-            return field_name
-
-    # Substring match: does the candidate contain a field name?
-    for field_name in target_fields:
-        field_lower = field_name.lower()
-        if field_lower in candidate or field_lower.replace("_", " ") in candidate:
-            return field_name
-
-    # Reverse substring: does any field name contain the candidate?
-    if len(candidate) >= 3:
-        for field_name in target_fields:
-            if candidate in field_name.lower() or candidate in field_name.lower().replace("_", " "):
-                return field_name
-
-    return None
+    candidate = _FILLER_WORDS_RE.sub("", candidate).strip()
+    candidate = _WHITESPACE_RE.sub(" ", candidate)
+
+    lows, spaced, exact = _field_index(tuple(target_fields))
+
+    # Exact match, either as spoken ("email address" -> "email_address") or
+    # with spaces read as underscores; the earliest matching field wins
+    hits = [i for i in (exact.get(candidate), exact.get(candidate.replace(" ", "_"))) if i is not None]
+    if hits:
+        return target_fields[min(hits)]
+
+    # One pass for both substring checks. A field name inside the candidate
+    # wins outright; otherwise fall back to the first field that contains
+    # the candidate (only for candidates of 3+ chars).
+    check_reverse = len(candidate) >= 3
+    reverse_hit = None
+    for i, (low, space) in enumerate(zip(lows, spaced)):
+        if low in candidate or space in candidate:
+            return target_fields[i]
+        if check_reverse and reverse_hit is None and (candidate in low or candidate in space):
+            reverse_hit = i
+
+    return None if reverse_hit is None else target_fields[reverse_hit]
 
 
 _MIN_SPEECH_CONFIDENCE = 0.4  # Ignore speech below this confidence (ambient noise)
@@ -175,10 +265,12 @@ def _parse_human_response(
     text_lower = speech_text.lower().strip()
 
     # Check for simple confirm/reject first
-    words = set(re.split(r"[\s,.\-!?]+", text_lower))
-    if words & _CONFIRM_WORDS and not (words & _REJECT_WORDS):
+    # frozenset.isdisjoint takes any iterable, so the word list isn't copied into a set
+    words = text_lower.translate(_PUNCT_TO_SPACE).split()
+    rejected = not _REJECT_WORDS.isdisjoint(words)
+    if not rejected and not _CONFIRM_WORDS.isdisjoint(words):
         return {"action": "confirmed", "corrected_to": None}
-    if words & _REJECT_WORDS:
+    if rejected:
         # Check if they also provided a correction
         field_match = _extract_field_from_speech(text_lower, target_fields)
         if field_match and field_match.lower() != suggested_mapping.lower():
@@ -196,6 +288,111 @@ def _parse_human_response(
 # ── Plivo Webhook Routes ────────────────────────────────
 
 _MAX_RETRIES = 2  # Max times to retry a question before auto-confirming
+_DTMF_ACTIONS = {"1": "confirmed", "2": "rejected"}  # Key presses that answer a question
+
+
+# ── Precompiled Plivo XML ───────────────────────────────
+#
+# The answer/input responses have a fixed shape; only a few strings vary.
+# Each template is rendered once through plivoxml with sentinel values,
+# then turned into a str.format template so requests only do escaping
+# and a single interpolation pass.
+
+_INPUT_PROMPT = "Press 1 for yes, 2 for no, or say the correct field name."
+_GOODBYE_TEXT = "That's all the questions. Thank you for your help! Goodbye."
+
+
+def _compile_xml_template(response: plivoxml.ResponseElement, **sentinels: str) -> str:
+    """Serialize a plivoxml tree and swap sentinel strings for format fields."""
+    xml = response.to_string().replace("{", "{{").replace("}", "}}")
+    for name, sentinel in sentinels.items():
+        xml = xml.replace(sentinel, "{" + name + "}")
+    return xml
+
+
+def _build_answer_template() -> str:
+    response = plivoxml.ResponseElement()
+    # Speak the full question first — no input detection active, so ambient
+    # noise cannot interrupt it.
+    response.add(plivoxml.SpeakElement("__QUESTION__"))
+    # Now open GetInput to listen — only the short instruction prompt plays
+    # while the speech/DTMF engine is active.
+    get_input = plivoxml.GetInputElement(
+        action="__ACTION__",
+        method="POST",
+        input_type="dtmf speech",
+        execution_timeout="15",
+        digit_end_timeout="10",
+        speech_end_timeout="3",
+        speech_model="phone_call",
+        redirect=True,
+    )
+    get_input.add_speak(content=_INPUT_PROMPT)
+    response.add(get_input)
+    # Fallback if GetInput times out with no input at all
+    response.add(plivoxml.SpeakElement("__FALLBACK_SPEAK__"))
+    response.add(plivoxml.RedirectElement("__FALLBACK_URL__"))
+    return _compile_xml_template(
+        response,
+        question="__QUESTION__",
+        action="__ACTION__",
+        fallback_speak="__FALLBACK_SPEAK__",
+        fallback_url="__FALLBACK_URL__",
+    )
+
+
+def _build_speak_template() -> str:
+    response = plivoxml.ResponseElement()
+    response.add(plivoxml.SpeakElement("__TEXT__"))
+    return _compile_xml_template(response, text="__TEXT__")
+
+
+def _build_speak_redirect_template() -> str:
+    response = plivoxml.ResponseElement()
+    response.add(plivoxml.SpeakElement("__TEXT__"))
+    response.add(plivoxml.RedirectElement("__URL__"))
+    return _compile_xml_template(response, text="__TEXT__", url="__URL__")
+
+
+def _build_redirect_template() -> str:
+    response = plivoxml.ResponseElement()
+    response.add(plivoxml.RedirectElement("__URL__"))
+    return _compile_xml_template(response, url="__URL__")
+
+
+def _build_speak_goodbye_template() -> str:
+    response = plivoxml.ResponseElement()
+    response.add(plivoxml.SpeakElement("__TEXT__"))
+    response.add(plivoxml.SpeakElement(_GOODBYE_TEXT))
+    return _compile_xml_template(response, text="__TEXT__")
+
+
+_ANSWER_XML_TEMPLATE = _build_answer_template()
+_SPEAK_XML_TEMPLATE = _build_speak_template()
+_SPEAK_REDIRECT_XML_TEMPLATE = _build_speak_redirect_template()
+_REDIRECT_XML_TEMPLATE = _build_redirect_template()
+_SPEAK_GOODBYE_XML_TEMPLATE = _build_speak_goodbye_template()
+
+_CALL_ERROR_XML = _SPEAK_XML_TEMPLATE.format(
+    text="Sorry, there was an error with this call. Goodbye."
+)
+_SESSION_ERROR_XML = _SPEAK_XML_TEMPLATE.format(text="Session error. Goodbye.")
+_GOODBYE_XML = plivoxml.ResponseElement().add(plivoxml.SpeakElement(_GOODBYE_TEXT)).to_string()
+
+
+def _xml_text(value: str) -> str:
+    """Escape a value for XML element text."""
+    return escape(value)
+
+
+def _xml_attr(value: str) -> str:
+    """Escape a value for a double-quoted XML attribute."""
+    return escape(value, {'"': "&quot;"})
+
+
+def _plivo_url(host_url: str, route: str, **params) -> str:
+    """Absolute URL of a Plivo callback route, with the query string encoded."""
+    return f"{host_url}plivo/{route}?{urlencode(params)}"
 
 
 @app.route("/plivo/answer", methods=["GET", "POST"])
@@ -207,11 +404,7 @@ def answer_call():
 
     session = get_call_session(session_id)
     if not session or index >= len(session.questions):
-        response = plivoxml.ResponseElement()
-        response.add(plivoxml.SpeakElement(
-            "Sorry, there was an error with this call. Goodbye."
-        ))
-        return Response(response.to_string(), mimetype="text/xml")
+        return Response(_CALL_ERROR_XML, mimetype="text/xml")
 
     question = session.questions[index]
     total = len(session.questions)
@@ -235,61 +428,37 @@ def answer_call():
         f"I found a column called {question.source_column}. "
         f"I think it maps to {question.suggested_mapping}."
     )
-    input_prompt = "Press 1 for yes, 2 for no, or say the correct field name."
-
-    response = plivoxml.ResponseElement()
-
-    # Speak the full question first — no input detection active, so ambient
-    # noise cannot interrupt it.
-    response.add(plivoxml.SpeakElement(question_text))
-
-    action_url = (
-        f"{request.host_url}plivo/input"
-        f"?session_id={session_id}&index={index}&retry={retry}"
-    )
 
-    # Now open GetInput to listen — only the short instruction prompt plays
-    # while the speech/DTMF engine is active.
-    get_input = plivoxml.GetInputElement(
-        action=action_url,
-        method="POST",
-        input_type="dtmf speech",
-        execution_timeout="15",
-        digit_end_timeout="10",
-        speech_end_timeout="3",
-        speech_model="phone_call",
-        redirect=True,
-    )
-    get_input.add_speak(content=input_prompt)
-    response.add(get_input)
+    host_url = request.host_url
+    action_url = _plivo_url(host_url, "input", session_id=session_id, index=index, retry=retry)
 
     # Fallback if GetInput times out with no input at all:
     # increment retry and try again, or auto-confirm and move on.
     next_retry = retry + 1
     if next_retry > _MAX_RETRIES:
-        # Auto-confirm after max retries and move to next question
-        response.add(plivoxml.SpeakElement(
-            f"No response received. I'll confirm {question.source_column} "
-            f"maps to {question.suggested_mapping} and move on."
-        ))
+        # Auto-confirm after max retries and move to next question.
         # We need to record this and chain to next — use a redirect to a
         # special auto-confirm path via /plivo/input with autoconfirm flag
-        auto_url = (
-            f"{request.host_url}plivo/input"
-            f"?session_id={session_id}&index={index}&autoconfirm=1"
+        fallback_speak = (
+            f"No response received. I'll confirm {question.source_column} "
+            f"maps to {question.suggested_mapping} and move on."
+        )
+        fallback_url = _plivo_url(
+            host_url, "input", session_id=session_id, index=index, autoconfirm=1
         )
-        response.add(plivoxml.RedirectElement(auto_url))
     else:
-        fallback_url = (
-            f"{request.host_url}plivo/answer"
-            f"?session_id={session_id}&index={index}&retry={next_retry}"
+        fallback_speak = "I didn't hear anything. Let me repeat."
+        fallback_url = _plivo_url(
+            host_url, "answer", session_id=session_id, index=index, retry=next_retry
         )
-        response.add(plivoxml.SpeakElement(
-            "I didn't hear anything. Let me repeat."
-        ))
-        response.add(plivoxml.RedirectElement(fallback_url))
 
-    return Response(response.to_string(), mimetype="text/xml")
+    xml = _ANSWER_XML_TEMPLATE.format(
+        question=_xml_text(question_text),
+        action=_xml_attr(action_url),
+        fallback_speak=_xml_text(fallback_speak),
+        fallback_url=_xml_text(fallback_url),
+    )
+    return Response(xml, mimetype="text/xml")
 
 
 @app.route("/plivo/input", methods=["GET", "POST"])
@@ -301,22 +470,25 @@ def handle_input():
     autoconfirm = request.args.get("autoconfirm", "")
 
     digits = request.form.get("Digits", "")
-    speech_text = request.form.get("Speech", "") or request.form.get("SpeechText", "")
-    confidence_str = request.form.get("Confidence", "")
-    confidence = float(confidence_str) if confidence_str else None
-
-    # Log what Plivo actually sent for debugging
-    app.logger.info(
-        "Plivo input: session=%s index=%s digits=%r speech=%r confidence=%s autoconfirm=%s form_keys=%s",
-        session_id, index, digits, speech_text, confidence_str, autoconfirm,
-        list(request.form.keys()),
-    )
+    if digits in _DTMF_ACTIONS:
+        # A key press is unambiguous, so the speech fields aren't consulted
+        speech_text, confidence_str, confidence = "", "", None
+    else:
+        speech_text = request.form.get("Speech", "") or request.form.get("SpeechText", "")
+        confidence_str = request.form.get("Confidence", "")
+        confidence = float(confidence_str) if confidence_str else None
+
+    # Log what Plivo actually sent for debugging (skip building form_keys when INFO is off)
+    if app.logger.isEnabledFor(logging.INFO):
+        app.logger.info(
+            "Plivo input: session=%s index=%s digits=%r speech=%r confidence=%s autoconfirm=%s form_keys=%s",
+            session_id, index, digits, speech_text, confidence_str, autoconfirm,
+            list(request.form.keys()),
+        )
 
     session = get_call_session(session_id)
     if not session or index >= len(session.questions):
-        response = plivoxml.ResponseElement()
-        response.add(plivoxml.SpeakElement("Session error. Goodbye."))
-        return Response(response.to_string(), mimetype="text/xml")
+        return Response(_SESSION_ERROR_XML, mimetype="text/xml")
 
     question = session.questions[index]
     total = len(session.questions)
@@ -324,6 +496,8 @@ def handle_input():
     # Handle auto-confirm (retry limit exceeded or explicit flag)
     if autoconfirm == "1":
         parsed = {"action": "confirmed", "corrected_to": None}
+    elif digits in _DTMF_ACTIONS:
+        parsed = {"action": _DTMF_ACTIONS[digits], "corrected_to": None}
     else:
         # Parse the response — pass confidence so low-confidence noise is ignored
         parsed = _parse_human_response(
@@ -331,7 +505,8 @@ def handle_input():
             confidence=confidence,
         )
 
-    response = plivoxml.ResponseElement()
+    # At most one spoken line precedes the redirect/goodbye
+    speak_text = None
 
     if parsed["action"] == "unclear":
         next_retry = retry + 1
@@ -339,22 +514,21 @@ def handle_input():
             # Too many retries — auto-confirm and move on
             app.logger.info("Max retries reached for index=%s, auto-confirming", index)
             parsed = {"action": "confirmed", "corrected_to": None}
-            response.add(plivoxml.SpeakElement(
+            speak_text = (
                 f"I'll go ahead and confirm {question.source_column} "
                 f"maps to {question.suggested_mapping}."
-            ))
+            )
             # Fall through to record + chain logic below
         else:
             # Retry: redirect back to the same question
-            response.add(plivoxml.SpeakElement(
-                "I didn't quite catch that. Let me ask again."
-            ))
-            retry_url = (
-                f"{request.host_url}plivo/answer"
-                f"?session_id={session_id}&index={index}&retry={next_retry}"
+            retry_url = _plivo_url(
+                request.host_url, "answer", session_id=session_id, index=index, retry=next_retry
+            )
+            xml = _SPEAK_REDIRECT_XML_TEMPLATE.format(
+                text="I didn't quite catch that. Let me ask again.",
+                url=_xml_text(retry_url),
             )
-            response.add(plivoxml.RedirectElement(retry_url))
-            return Response(response.to_string(), mimetype="text/xml")
+            return Response(xml, mimetype="text/xml")
 
     # Record the response
     set_mapping_response(
@@ -382,137 +556,240 @@ def handle_input():
     # Speak acknowledgment (only if we haven't already spoken above)
     if autoconfirm != "1" and not (retry > 0 and parsed["action"] == "confirmed"):
         if parsed["action"] == "confirmed":
-            response.add(plivoxml.SpeakElement(
+            speak_text = (
                 f"Got it. Confirmed: {question.source_column} maps to {question.suggested_mapping}."
-            ))
+            )
         elif parsed["action"] == "corrected":
             corrected_to = parsed["corrected_to"]
-            response.add(plivoxml.SpeakElement(
-                f"Got it. I'll map {question.source_column} to {corrected_to} instead."
-            ))
+            speak_text = f"Got it. I'll map {question.source_column} to {corrected_to} instead."
         elif parsed["action"] == "rejected":
-            response.add(plivoxml.SpeakElement(
-                f"Understood. I will skip the mapping for {question.source_column}."
-            ))
+            speak_text = f"Understood. I will skip the mapping for {question.source_column}."
 
     # Chain to next question or end
     next_index = index + 1
     if next_index < total:
-        next_url = (
-            f"{request.host_url}plivo/answer"
-            f"?session_id={session_id}&index={next_index}&retry=0"
-        )
-        response.add(plivoxml.RedirectElement(next_url))
-    else:
-        response.add(plivoxml.SpeakElement(
-            "That's all the questions. Thank you for your help! Goodbye."
+        next_url = _xml_text(_plivo_url(
+            request.host_url, "answer", session_id=session_id, index=next_index, retry=0
         ))
+        if speak_text is None:
+            xml = _REDIRECT_XML_TEMPLATE.format(url=next_url)
+        else:
+            xml = _SPEAK_REDIRECT_XML_TEMPLATE.format(text=_xml_text(speak_text), url=next_url)
+    else:
         mark_session_complete(session_id)
+        if speak_text is None:
+            xml = _GOODBYE_XML
+        else:
+            xml = _SPEAK_GOODBYE_XML_TEMPLATE.format(text=_xml_text(speak_text))
 
-    return Response(response.to_string(), mimetype="text/xml")
+    return Response(xml, mimetype="text/xml")
 
 
 # ── Mock Portal Routes ──────────────────────────────────
 
+# The portal templates use no request-context globals, so they are compiled
+# once and rendered directly instead of going through render_template().
+# Login pages depend only on the fixed portal config: render them up front.
+_PORTAL_DASHBOARD_TEMPLATE = app.jinja_env.get_template("portal_dashboard.html")
+_PORTAL_LOGIN_HTML = {
+    key: app.jinja_env.get_template("portal_login.html").render(
+        client_name=cfg["client_name"],
+        client_key=key,
+        primary_color=cfg["primary_color"],
+    ).encode("utf-8")
+    for key, cfg in PORTAL_CONFIGS.items()
+}
+
+
+def _static_page(html: bytes) -> Response:
+    """Response for a pre-rendered page that only changes on redeploy."""
+    response = Response(html, mimetype="text/html")
+    response.cache_control.public = True
+    response.cache_control.max_age = 60
+    return response
+
+
 @app.route("/portal/<client_key>", methods=["GET"])
-def portal_login(client_key):
+@_with_portal
+def portal_login(config, client_key):
     """Show the ugly legacy login page."""
-    config = PORTAL_CONFIGS.get(client_key)
-    if not config:
-        return "Unknown client portal", 404
-    return render_template(
-        "portal_login.html",
-        client_name=config["client_name"],
-        client_key=client_key,
-        primary_color=config["primary_color"],
-    )
+    return _static_page(_PORTAL_LOGIN_HTML[client_key])
 
 
 @app.route("/portal/<client_key>", methods=["POST"])
-def portal_login_submit(client_key):
+@_with_portal
+def portal_login_submit(config, client_key):
     """Handle login form submission — always succeeds, redirects to dashboard."""
-    config = PORTAL_CONFIGS.get(client_key)
-    if not config:
-        return "Unknown client portal", 404
     return redirect(url_for("portal_dashboard", client_key=client_key))
 
 
-@app.route("/portal/<client_key>/dashboard", methods=["GET"])
-def portal_dashboard(client_key):
-    """Show the data dashboard with CSV table."""
-    config = PORTAL_CONFIGS.get(client_key)
-    if not config:
-        return "Unknown client portal", 404
+# Rendered dashboard pages keyed by client: (csv mtime_ns, html bytes, etag)
+_dashboard_html: dict[str, tuple[int, bytes, str]] = {}
+
 
-    columns, rows, _ = _load_csv(client_key)
-    return render_template(
-        "portal_dashboard.html",
+def _render_portal_dashboard(client_key: str) -> tuple[bytes, str]:
+    """Render a client's dashboard page, reusing it until the CSV changes.
+
+    Returns (html, etag).
+    """
+    mtime, columns, rows, row_count = _load_csv(client_key)
+    cached = _dashboard_html.get(client_key)
+    if cached and cached[0] == mtime:
+        return cached[1], cached[2]
+
+    config = PORTAL_CONFIGS[client_key]
+    html = _PORTAL_DASHBOARD_TEMPLATE.render(
         client_name=config["client_name"],
         client_key=client_key,
         primary_color=config["primary_color"],
         columns=columns,
         rows=rows,
-        row_count=len(rows),
+        row_count=row_count,
         last_updated="11/02/2003 11:30 AM",
-    )
+    ).encode("utf-8")
+    etag = hashlib.sha1(html).hexdigest()
+    _dashboard_html[client_key] = (mtime, html, etag)
+    return html, etag
+
+
+@app.route("/portal/<client_key>/dashboard", methods=["GET"])
+@_with_portal
+def portal_dashboard(config, client_key):
+    """Show the data dashboard with CSV table."""
+    html, etag = _render_portal_dashboard(client_key)
+    response = Response(html, mimetype="text/html")
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
+
+# Gzipped CSVs keyed by client: (csv mtime_ns, gzip bytes, etag)
+_csv_gzip: dict[str, tuple[int, bytes, str]] = {}
+_GZIP_MAX_BYTES = 4 * 1024 * 1024  # Larger CSVs are streamed uncompressed instead
+
+
+def _gzipped_csv(client_key: str) -> tuple[bytes, str]:
+    """Return (gzip bytes, etag) for a client's CSV, recompressing only on change."""
+    csv_path = _CSV_PATHS[client_key]
+    mtime = os.stat(csv_path).st_mtime_ns
+    cached = _csv_gzip.get(client_key)
+    if cached and cached[0] == mtime:
+        return cached[1], cached[2]
+
+    with open(csv_path, "rb") as f:
+        raw = f.read()
+    data = gzip.compress(raw, compresslevel=6, mtime=0)
+    etag = hashlib.sha1(raw).hexdigest() + "-gzip"
+    _csv_gzip[client_key] = (mtime, data, etag)
+    return data, etag
 
 
 @app.route("/portal/<client_key>/download", methods=["GET"])
-def portal_download(client_key):
-    """Return raw CSV file for download."""
-    config = PORTAL_CONFIGS.get(client_key)
-    if not config:
-        return "Unknown client portal", 404
-
-    _, _, raw_csv = _load_csv(client_key)
-    return Response(
-        raw_csv,
-        mimetype="text/csv",
-        headers={"Content-Disposition": f"attachment; filename={client_key}_data.csv"},
-    )
+@_with_portal
+def portal_download(config, client_key):
+    """Return raw CSV file for download (no parsing).
+
+    Clients that accept gzip get a cached compressed copy of files up to
+    _GZIP_MAX_BYTES. Everything else is streamed from disk in blocks by
+    send_file, so memory use doesn't grow with file size.
+    """
+    csv_path = _CSV_PATHS[client_key]
+    download_name = f"{client_key}_data.csv"
+    if request.accept_encodings["gzip"] and os.path.getsize(csv_path) <= _GZIP_MAX_BYTES:
+        data, etag = _gzipped_csv(client_key)
+        response = Response(data, mimetype="text/csv")
+        response.headers["Content-Encoding"] = "gzip"
+        response.headers["Content-Disposition"] = f"attachment; filename={download_name}"
+        response.set_etag(etag)
+        response = response.make_conditional(request)
+    else:
+        response = send_file(
+            csv_path,
+            mimetype="text/csv",
+            as_attachment=True,
+            download_name=download_name,
+            conditional=True,
+        )
+    response.vary.add("Accept-Encoding")
+    return response
 
 
 # ── Landing Page ────────────────────────────────────────
 
+_LANDING_HTML = app.jinja_env.get_template("landing.html").render().encode("utf-8")
+
+
 @app.route("/", methods=["GET"])
 def landing():
     """Startup landing page."""
-    return render_template("landing.html")
+    return _static_page(_LANDING_HTML)
 
 
 # ── Live Dashboard Routes ───────────────────────────────
 
+_SSE_MAX_BATCH = 32  # Stop waiting for more once a batch has this many events
+_SSE_BATCH_WINDOW_SECS = 0.02  # How long to wait for more events to batch
+_SSE_MAX_CLIENTS = 32  # Each SSE stream holds a server thread; cap them
+_SSE_KEEPALIVE_SECS = 15  # Idle wait before sending a keepalive comment
+# Sent instead of a stream once _SSE_MAX_CLIENTS are connected. EventSource
+# gives up for good on a non-200 reply, but reconnects after ``retry`` ms
+# when a 200 stream ends. A closed client only frees its slot at its next
+# keepalive, so wait longer than that before trying again.
+_SSE_FULL_FRAME = (
+    f": too many dashboard connections\nretry: {(_SSE_KEEPALIVE_SECS + 5) * 1000}\n\n"
+).encode("utf-8")
+
+_DASHBOARD_HTML = app.jinja_env.get_template("dashboard.html").render().encode("utf-8")
+
+
 @app.route("/dashboard", methods=["GET"])
 def dashboard():
     """Serve the live demo dashboard."""
-    return render_template("dashboard.html")
+    return _static_page(_DASHBOARD_HTML)
 
 
 @app.route("/dashboard/events", methods=["GET"])
 def dashboard_events():
     """SSE endpoint — streams pipeline events to the dashboard."""
+    # Take the slot now, atomically, rather than when the stream starts
+    start = subscribe(limit=_SSE_MAX_CLIENTS)
+    if start is None:
+        return Response(
+            _SSE_FULL_FRAME,
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache"},
+        )
+
     def event_stream():
-        q = subscribe()
-        try:
-            # Send initial keepalive so the browser fires onopen
-            yield ": connected\n\n"
-
-            # Send event history for late joiners
-            for event in get_history():
-                yield format_sse(event)
-
-            # Stream new events
-            while True:
-                try:
-                    event = q.get(timeout=15)
-                    yield format_sse(event)
-                except Exception:
-                    # Send keepalive comment
-                    yield ": keepalive\n\n"
-        finally:
-            unsubscribe(q)
-
-    return Response(
+        cursor = start
+        # Send initial keepalive so the browser fires onopen
+        yield b": connected\n\n"
+
+        # Replay retained history for late joiners in a single write
+        cursor, history = read_events(cursor)
+        if history:
+            yield b"".join(history)
+
+        # Stream new events (already SSE-encoded by emit_event).
+        # After the first event, keep collecting for a short window so
+        # bursts go out in one write.
+        while True:
+            cursor, batch = read_events(cursor, timeout=_SSE_KEEPALIVE_SECS)
+            if not batch:
+                # Send keepalive comment
+                yield b": keepalive\n\n"
+                continue
+            deadline = time.monotonic() + _SSE_BATCH_WINDOW_SECS
+            while len(batch) < _SSE_MAX_BATCH:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                cursor, more = read_events(cursor, timeout=remaining)
+                if not more:
+                    break
+                batch.extend(more)
+            yield b"".join(batch)
+
+    response = Response(
         event_stream(),
         mimetype="text/event-stream",
         headers={
@@ -520,16 +797,29 @@ def dashboard_events():
             "X-Accel-Buffering": "no",
         },
     )
+    # The server closes the response even if the stream never started
+    response.call_on_close(unsubscribe)
+    return response
 
 
 # ── Demo Control Routes ─────────────────────────────────
 
+def get_agent():
+    """Return the shared FDEAgent, constructing it on first call.
+
+    Building an agent opens the vector store and API clients, so the
+    server keeps one instance instead of paying that cost per demo run.
+    """
+    global _agent
+    with _agent_lock:
+        if _agent is None:
+            _agent = FDEAgent()
+        return _agent
+
+
 def _run_demo_background(config=None):
     """Run the full demo pipeline in a background thread."""
-    global _demo_running
     try:
-        from src.agent import FDEAgent
-
         config = config or {}
         clients = config.get("clients", [])
         target_fields = config.get("target_fields")
@@ -546,7 +836,8 @@ def _run_demo_background(config=None):
                 },
             }
 
-        agent = FDEAgent(target_schema=target_schema)
+        agent = get_agent()
+        agent.target_schema = target_schema if target_schema is not None else load_target_schema()
         agent.reset_memory()
         reset_events()
         emit_event("reset", {})
@@ -600,29 +891,31 @@ def _run_demo_background(config=None):
     except Exception as e:
         emit_event("error", {"message": str(e)})
     finally:
-        with _demo_lock:
-            _demo_running = False
+        _demo_lock.release()
 
 
 @app.route("/demo/start", methods=["POST"])
 def demo_start():
     """Start the demo pipeline in a background thread."""
-    global _demo_running
-    with _demo_lock:
-        if _demo_running:
-            return {"status": "already_running"}, 409
-        _demo_running = True
+    if not _demo_lock.acquire(blocking=False):
+        return {"status": "already_running"}, 409
 
     config = request.get_json(silent=True) or {}
+    # Must stay in-process: the Plivo webhooks record answers in
+    # src.teacher's call sessions, which the agent polls while on a call.
     thread = threading.Thread(target=_run_demo_background, args=(config,), daemon=True)
-    thread.start()
+    try:
+        thread.start()
+    except Exception:
+        _demo_lock.release()
+        raise
     return {"status": "started"}
 
 
 @app.route("/demo/status", methods=["GET"])
 def demo_status():
     """Check if the demo is currently running."""
-    return {"running": _demo_running}
+    return {"running": _demo_lock.locked()}
 
 
 # ── Health ──────────────────────────────────────────────
@@ -635,8 +928,36 @@ def health():
 
 # ── Server Entry Point ──────────────────────────────────
 
+def _warm_caches() -> None:
+    """Parse portal CSVs and render their dashboards before the first request."""
+    for client_key in PORTAL_CONFIGS:
+        _render_portal_dashboard(client_key)
+
+
+def _warm_agent() -> None:
+    """Build the shared agent and load its embedding model."""
+    agent = get_agent()
+    try:
+        agent.memory.warm_up()
+    except Exception as e:
+        app.logger.warning("Embedding model warm-up failed: %s", e)
+
+
+def prepare_server() -> None:
+    """Warm caches and start building the agent before serving traffic."""
+    _warm_caches()
+    # Build the shared agent in the background so /demo/start doesn't wait on it
+    threading.Thread(target=_warm_agent, daemon=True).start()
+
+
 def start_server(port: int = 5001):
-    """Start the webhook server."""
+    """Start the webhook server.
+
+    Werkzeug's server closes the connection after every response. For
+    keep-alive, run ``server.wsgi:app`` under a threaded WSGI server
+    instead (see server/wsgi.py).
+    """
+    prepare_server()
     app.run(host="0.0.0.0", port=port, debug=False, threaded=True)
 
 
@@ -0,0 +1,16 @@
+"""WSGI entry point for serving the app with a production server.
+
+    gunicorn -k gthread -w 1 --threads 40 -b 0.0.0.0:5001 server.wsgi:app
+
+Use one worker process: demo state, the event bus and Plivo call sessions
+all live in-process. Each open /dashboard/events stream holds a thread, so
+give it headroom above _SSE_MAX_CLIENTS. Greenlet workers (gevent) are not
+recommended: the agent's Chroma and Gemini calls block in C and would
+stall every other connection on the loop.
+"""
+
+from server.webhooks import app, prepare_server
+
+prepare_server()
+
+__all__ = ["app"]
@@ -10,6 +10,8 @@ Coordinates all components:
 
 import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
@@ -21,10 +23,44 @@ from src.research import ResearchEngine
 from src.browser import BrowserAgent
 from src.teacher import Teacher
 from src.tools import ToolExecutor
-from server.events import emit_event
+from server.events import emit_event, emit_events_batch
 
 console = Console()
 
+TARGET_SCHEMA_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "data", "target_schema.json"
+)
+
+AUTO_MAP_CONFIDENCE = frozenset({"high", "medium"})  # Gemini confidences accepted without a call
+
+# Rich markup for the mapping table's confidence column
+_CONFIDENCE_LABELS = {
+    "high": "[bold green]HIGH[/bold green]",
+    "medium": "[yellow]MEDIUM[/yellow]",
+}
+_LOW_CONFIDENCE_LABEL = "[bold red]LOW[/bold red]"
+
+
+# Parsed default schema: (file mtime_ns, schema)
+_target_schema_cache: tuple[int, dict] | None = None
+
+
+def load_target_schema() -> dict:
+    """Load the default target schema from disk.
+
+    The parsed schema is cached and re-read only when the file changes.
+    It is shared between callers, so treat it as read-only.
+    """
+    global _target_schema_cache
+    mtime = os.stat(TARGET_SCHEMA_PATH).st_mtime_ns
+    cached = _target_schema_cache
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with open(TARGET_SCHEMA_PATH) as f:
+        schema = json.load(f)
+    _target_schema_cache = (mtime, schema)
+    return schema
+
 
 class FDEAgent:
     """The Forward Deployed Engineer - a continual learning agent."""
@@ -40,12 +76,7 @@ class FDEAgent:
         if target_schema is not None:
             self.target_schema = target_schema
         else:
-            # Load target schema from disk
-            schema_path = os.path.join(
-                os.path.dirname(os.path.dirname(__file__)), "data", "target_schema.json"
-            )
-            with open(schema_path) as f:
-                self.target_schema = json.load(f)
+            self.target_schema = load_target_schema()
 
     def onboard_client(self, client_name: str, portal_url: str, credentials: dict | None = None) -> dict:
         """Run the full onboarding pipeline for a client.
@@ -78,6 +109,13 @@ class FDEAgent:
             "sheet_url": "",
         }
 
+        # Warm memory lookups in the shadow of the scrape
+        threading.Thread(
+            target=self._prewarm_memory,
+            args=(list(self.target_schema.get("fields", {}).keys()),),
+            daemon=True,
+        ).start()
+
         # === Step 1: Scrape Data ===
         emit_event("step_start", {"step": "scrape", "message": f"Scraping data from {client_name} portal"})
         console.print("\n[bold cyan]Step 1: Fetching Client Data (AGI Inc Browser)[/bold cyan]")
@@ -101,39 +139,39 @@ class FDEAgent:
         console.print("\n[bold cyan]Step 2: Analyzing Columns (Gemini + You.com + Memory)[/bold cyan]")
         mappings = self.brain.analyze_columns(columns, sample_data, self.target_schema)
 
-        # Categorize results
+        # Categorize results and build the dashboard events and table rows in one pass
         confident = []
         uncertain = []
+        events = []
+        table_rows = []
+        from_memory_count = 0
+        auto_mapped_count = 0
         for m in mappings:
-            if m.get("from_memory"):
+            source, target, conf = m["source_column"], m["target_field"], m["confidence"]
+            from_memory = m.get("from_memory", False)
+            if from_memory:
                 confident.append(m)
-                summary["from_memory"] += 1
-            elif m["confidence"] == "high":
+                from_memory_count += 1
+                events.append(("memory_recall", {"source": source, "target": target}))
+            elif conf in AUTO_MAP_CONFIDENCE:
                 confident.append(m)
-                summary["auto_mapped"] += 1
-            elif m["confidence"] == "medium":
-                confident.append(m)
-                summary["auto_mapped"] += 1
+                auto_mapped_count += 1
             else:
                 uncertain.append(m)
-
-        # Emit individual mapping results for dashboard
-        for m in mappings:
-            if m.get("from_memory"):
-                emit_event("memory_recall", {
-                    "source": m["source_column"],
-                    "target": m["target_field"],
-                })
-            emit_event("mapping_result", {
-                "source": m["source_column"],
-                "target": m["target_field"],
-                "confidence": m["confidence"],
-                "from_memory": m.get("from_memory", False),
-            })
-        emit_event("step_complete", {"step": "analyze", "message": f"Mapped {len(mappings)} columns"})
+            events.append(("mapping_result", {
+                "source": source,
+                "target": target,
+                "confidence": conf,
+                "from_memory": from_memory,
+            }))
+            table_rows.append((source, target, conf, "Memory" if from_memory else "Gemini AI"))
+        summary["from_memory"] = from_memory_count
+        summary["auto_mapped"] = auto_mapped_count
+        events.append(("step_complete", {"step": "analyze", "message": f"Mapped {len(mappings)} columns"}))
+        emit_events_batch(events)
 
         # Display mapping table
-        self._display_mappings(mappings)
+        self._display_mappings(table_rows)
 
         # === Step 3: Handle Uncertain Mappings (Batch Phone Call) ===
         # For the first client (Novice phase: no prior memory), always verify at
@@ -142,18 +180,29 @@ class FDEAgent:
         target_field_names = list(self.target_schema.get("fields", {}).keys())
 
         if not uncertain and is_novice and confident:
-            # No uncertain fields but this is the first client — demote
-            # non-memory mappings to uncertain so we make a call.
-            demoted = 0
-            for m in list(reversed(confident)):
-                if not m.get("from_memory"):
-                    confident.remove(m)
-                    summary["auto_mapped"] -= 1
-                    m["confidence"] = "low"
-                    uncertain.append(m)
-                    demoted += 1
-                    if demoted >= 2:
-                        break
+            # No uncertain fields but this is the first client — demote the
+            # last two mappings to uncertain so we make a call. Nothing came
+            # from memory here, so every confident mapping is an AI one.
+            demote = confident[-2:]
+            del confident[-2:]
+            summary["auto_mapped"] -= len(demote)
+            for m in reversed(demote):
+                m["confidence"] = "low"
+                uncertain.append(m)
+
+        # The confident AI mappings can't change during the call, so start
+        # writing them to memory in the background while the phone rings.
+        early_items = []
+        early_store = None
+        if uncertain:
+            early_items = [
+                (m["source_column"], m["target_field"], client_name)
+                for m in confident if not m.get("from_memory")
+            ]
+        if early_items:
+            pool = ThreadPoolExecutor(max_workers=1)
+            early_store = pool.submit(self.memory.store_mappings_bulk, early_items, announce=False)
+            pool.shutdown(wait=False)
 
         if uncertain:
             emit_event("step_start", {
@@ -242,18 +291,21 @@ class FDEAgent:
         # === Step 4: Store New Learnings ===
         emit_event("step_start", {"step": "learn", "message": "Storing new mappings in vector memory"})
         console.print("\n[bold cyan]Step 4: Updating Memory (Continual Learning)[/bold cyan]")
-        new_learnings = 0
-        for m in confident:
-            if not m.get("from_memory"):
-                self.memory.store_mapping(
-                    m["source_column"], m["target_field"], client_name
-                )
-                new_learnings += 1
-                emit_event("memory_store", {
-                    "source": m["source_column"],
-                    "target": m["target_field"],
-                    "client": client_name,
-                })
+        new_items = [
+            (m["source_column"], m["target_field"], client_name)
+            for m in confident if not m.get("from_memory")
+        ]
+        # Mappings confirmed on the call were appended after the early ones.
+        # The background write was silent; print its lines here, in order.
+        if early_store is not None:
+            early_store.result()
+            self.memory.announce_stored(early_items)
+        self.memory.store_mappings_bulk(new_items[len(early_items):])
+        emit_events_batch([
+            ("memory_store", {"source": source, "target": target, "client": client})
+            for source, target, client in new_items
+        ])
+        new_learnings = len(new_items)
         summary["new_learnings"] = new_learnings
         emit_event("memory_update", {"count": new_learnings, "total": self.memory.count})
 
@@ -284,28 +336,47 @@ class FDEAgent:
 
         return summary
 
-    def _display_mappings(self, mappings: list[dict]) -> None:
-        """Display a rich table of column mappings."""
+    def _prewarm_memory(self, candidates: list[str]) -> None:
+        """Pre-query memory for likely column names while the browser scrapes.
+
+        Candidates are the target field names plus every source column learned
+        from earlier clients. The results land in MemoryStore's match cache,
+        and the embedding model gets loaded even when memory is empty, so
+        analyze_columns and Step 4 mostly hit warm paths. Best effort:
+        failures are logged and the pipeline carries on cold.
+        """
+        try:
+            if self.memory.count == 0:
+                # Nothing to look up yet, but Step 4 will need the embedding model
+                self.memory.warm_up()
+                return
+            names = dict.fromkeys(candidates)
+            names.update(dict.fromkeys(m["source_column"] for m in self.memory.get_all_mappings()))
+            self.memory.find_matches_batch(list(names))
+        except Exception as e:
+            console.print(f"  [dim]Memory warm-up failed: {e}[/dim]")
+
+    def _display_mappings(self, rows: list[tuple[str, str, str, str]]) -> None:
+        """Display a rich table of column mappings.
+
+        ``rows`` are (source column, target field, confidence, source) tuples
+        collected while the mappings were categorized. Skipped when stdout
+        isn't a terminal (e.g. running under the server), since nobody is
+        watching the table there.
+        """
+        if not console.is_terminal:
+            return
         table = Table(title="Column Mapping Results", show_lines=True)
         table.add_column("Source Column", style="cyan")
         table.add_column("Target Field", style="green")
         table.add_column("Confidence", justify="center")
         table.add_column("Source", style="dim")
 
-        for m in mappings:
-            conf = m["confidence"]
-            if conf == "high":
-                conf_style = "[bold green]HIGH[/bold green]"
-            elif conf == "medium":
-                conf_style = "[yellow]MEDIUM[/yellow]"
-            else:
-                conf_style = "[bold red]LOW[/bold red]"
-
-            source = "Memory" if m.get("from_memory") else "Gemini AI"
+        for source_column, target_field, conf, source in rows:
             table.add_row(
-                m["source_column"],
-                m["target_field"],
-                conf_style,
+                source_column,
+                target_field,
+                _CONFIDENCE_LABELS.get(conf, _LOW_CONFIDENCE_LABEL),
                 source,
             )
 
@@ -313,7 +384,9 @@ class FDEAgent:
         console.print(table)
 
     def _display_summary(self, summary: dict) -> None:
-        """Display the final onboarding summary."""
+        """Display the final onboarding summary (terminal only, like the mapping table)."""
+        if not console.is_terminal:
+            return
         console.print()
         panel_text = (
             f"[bold]Client:[/bold] {summary['client']}\n"
@@ -5,6 +5,10 @@ to the target schema with confidence scores.
 """
 
 import json
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+import httpx
 from google import genai
 from google.genai import types
 from rich.console import Console
@@ -16,6 +20,12 @@ from server.events import emit_event
 
 console = Console()
 
+# The SDK's pooled connections otherwise expire after 5s idle, which is
+# shorter than a phone call between two Gemini requests in the demo.
+GEMINI_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=4, keepalive_expiry=120)
+RESEARCH_MAX_COLUMNS = 3  # Unknown columns researched per analyze call (limits API calls)
+RESPONSE_CACHE_SIZE = 512  # Gemini mapping replies kept per Brain, keyed by prompt
+
 SYSTEM_INSTRUCTION = """You are an expert data mapping agent. Your job is to map source CSV column names to a target CRM schema.
 
 For each source column, you must:
@@ -49,6 +59,101 @@ MAPPING_SCHEMA = {
 }
 
 
+# Checks for one parsed mapping, pulled out of MAPPING_SCHEMA once
+_MAPPING_ITEM_SCHEMA = MAPPING_SCHEMA["properties"]["mappings"]["items"]
+_MAPPING_REQUIRED = tuple(_MAPPING_ITEM_SCHEMA["required"])
+_CONFIDENCE_LEVELS = frozenset(_MAPPING_ITEM_SCHEMA["properties"]["confidence"]["enum"])
+
+
+def _validate_mappings(mappings) -> list[dict]:
+    """Return Gemini's mappings list, or raise ValueError if it breaks MAPPING_SCHEMA."""
+    if not isinstance(mappings, list):
+        raise ValueError("mappings is not a list")
+    for m in mappings:
+        if not isinstance(m, dict):
+            raise ValueError(f"mapping is not an object: {m!r}")
+        for key in _MAPPING_REQUIRED:
+            if not isinstance(m.get(key), str):
+                raise ValueError(f"mapping field '{key}' missing or not a string: {m!r}")
+        if m["confidence"] not in _CONFIDENCE_LEVELS:
+            raise ValueError(f"unknown confidence '{m['confidence']}'")
+    return mappings
+
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _parse_new_mappings(buf: str, pos: int | None) -> tuple[list[dict], int | None]:
+    """Pull finished mapping objects out of a partially streamed response.
+
+    ``pos`` is where the previous call stopped (None until the "mappings"
+    array has started). Returns (objects completed since then, new pos).
+    """
+    if pos is None:
+        key = buf.find('"mappings"')
+        bracket = buf.find("[", key) if key >= 0 else -1
+        if bracket < 0:
+            return [], None
+        pos = bracket + 1
+
+    found = []
+    while True:
+        while pos < len(buf) and buf[pos] in " \t\r\n,":
+            pos += 1
+        if pos >= len(buf) or buf[pos] != "{":
+            return found, pos
+        try:
+            obj, pos_end = _JSON_DECODER.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            return found, pos  # Object not finished yet
+        found.append(obj)
+        pos = pos_end
+
+
+# Column name -> (target field, confidence) used by the demo-mode mock analysis
+_KNOWN_MAPPINGS = MappingProxyType({
+    "cust_id": ("customer_id", "high"),
+    "customer_id": ("customer_id", "high"),
+    "cust_nm": ("full_name", "high"),
+    "full_name": ("full_name", "high"),
+    "cust_lvl_v2": ("subscription_tier", "low"),
+    "customer_level_ver2": ("subscription_tier", "high"),
+    "signup_dt": ("signup_date", "high"),
+    "registration_date": ("signup_date", "high"),
+    "email_addr": ("email", "high"),
+    "contact_email": ("email", "high"),
+    "phone_num": ("phone", "high"),
+    "mobile": ("phone", "high"),
+    "addr_line1": ("address", "high"),
+    "street_address": ("address", "high"),
+    "city_nm": ("city", "high"),
+    "city": ("city", "high"),
+    "st_cd": ("state", "high"),
+    "state_code": ("state", "high"),
+    "zip_cd": ("zip_code", "high"),
+    "postal_code": ("zip_code", "high"),
+    "dob": ("date_of_birth", "high"),
+    "date_of_birth": ("date_of_birth", "high"),
+    "acct_bal": ("account_balance", "high"),
+    "balance_usd": ("account_balance", "high"),
+    "last_login_ts": ("last_login", "high"),
+    "last_activity": ("last_login", "high"),
+    "is_active_flg": ("is_active", "high"),
+    "status": ("is_active", "high"),
+})
+
+# Full mock result for each known column, minus source_column. Read-only;
+# _mock_analyze copies these, since callers update the result dicts in place.
+_KNOWN_RESULTS = MappingProxyType({
+    col: MappingProxyType({
+        "target_field": target,
+        "confidence": conf,
+        "reasoning": f"Pattern match: '{col}' -> '{target}'",
+    })
+    for col, (target, conf) in _KNOWN_MAPPINGS.items()
+})
+
+
 class Brain:
     """Gemini-powered reasoning engine with confidence scoring."""
 
@@ -56,9 +161,24 @@ class Brain:
         self._memory = memory
         self._research = research
         if not Config.DEMO_MODE:
-            self._client = genai.Client(api_key=Config.GEMINI_API_KEY)
+            self._client = genai.Client(
+                api_key=Config.GEMINI_API_KEY,
+                http_options=types.HttpOptions(client_args={"limits": GEMINI_HTTP_LIMITS}),
+            )
         else:
             self._client = None
+        # Identical for every request, so build it once
+        self._gen_config = types.GenerateContentConfig(
+            system_instruction=SYSTEM_INSTRUCTION,
+            response_mime_type="application/json",
+            response_schema=MAPPING_SCHEMA,
+            temperature=0.1,
+        )
+        # (fields dict, field names, prompt description) for the last schema seen
+        self._target_desc_cache: tuple[dict, list[str], str] | None = None
+        # Parsed Gemini mappings by exact prompt, so a repeated column batch
+        # (same schema, samples and research) skips the call entirely.
+        self._response_cache: OrderedDict[str, list[dict]] = OrderedDict()
 
     def analyze_columns(
         self, columns: list[str], sample_data: dict[str, list[str]], target_schema: dict
@@ -77,8 +197,9 @@ class Brain:
 
         # Step 1: Check memory for each column
         emit_event("brain_thought", {"thought": "Scanning vector memory for known patterns...", "confidence": 10})
-        for col in columns:
-            match = self._memory.find_match(col)
+        # One batched vector query covers every column not already cached
+        matches = self._memory.find_matches_batch(columns)
+        for col, match in zip(columns, matches):
             if match:
                 console.print(
                     f"  [green]Memory match:[/green] '{col}' -> '{match['target_field']}' "
@@ -102,9 +223,13 @@ class Brain:
         console.print(f"  [blue]Researching {len(unknown_columns)} unknown columns...[/blue]")
         emit_event("brain_thought", {"thought": f"Researching {len(unknown_columns)} unknown columns via You.com API...", "confidence": 30})
         
+        # The searches are independent HTTP round-trips, so overlap them
+        research_columns = unknown_columns[:RESEARCH_MAX_COLUMNS]
+        with ThreadPoolExecutor(max_workers=len(research_columns)) as pool:
+            contexts = list(pool.map(self._research.get_column_context, research_columns))
+
         research_context = ""
-        for col in unknown_columns[:3]:  # Limit API calls
-            ctx = self._research.get_column_context(col)
+        for col, ctx in zip(research_columns, contexts):
             if ctx:
                 emit_event("brain_thought", {"thought": f"Context found for '{col}'", "confidence": 45})
                 research_context += f"\nContext for '{col}': {ctx}\n"
@@ -128,8 +253,10 @@ class Brain:
         research_context: str,
     ) -> list[dict]:
         """Use Gemini to analyze columns and produce mappings."""
-        target_fields = list(target_schema.get("fields", {}).keys())
-        target_desc = json.dumps(target_schema.get("fields", {}), indent=2)
+        if Config.DEMO_MODE:
+            return self._mock_analyze(columns, target_schema)
+
+        target_fields, target_desc = self._describe_target(target_schema)
 
         # Build sample data preview
         samples_text = ""
@@ -137,92 +264,89 @@ class Brain:
             if col in sample_data:
                 samples_text += f"  {col}: {sample_data[col][:3]}\n"
 
+        # The target schema goes first so every request for the same schema
+        # shares one long prefix, which Gemini's implicit caching can reuse.
         prompt = f"""Analyze these source CSV columns and map them to the target schema.
 
-SOURCE COLUMNS: {columns}
-
-SAMPLE DATA:
-{samples_text}
-
 TARGET SCHEMA FIELDS: {target_fields}
 
 TARGET FIELD DESCRIPTIONS:
 {target_desc}
 
+SOURCE COLUMNS: {columns}
+
+SAMPLE DATA:
+{samples_text}
+
 RESEARCH CONTEXT:
 {research_context if research_context else "No additional context available."}
 
 Map each source column to the most likely target field. Be confident — common abbreviations and naming patterns should be rated "high".
 Only rate a column "low" if it is truly ambiguous and the target field cannot be determined with reasonable certainty."""
 
-        if Config.DEMO_MODE:
-            return self._mock_analyze(columns, target_schema)
+        cached = self._response_cache.get(prompt)
+        if cached is not None:
+            self._response_cache.move_to_end(prompt)
+            emit_event("brain_thought", {"thought": "Reusing Gemini analysis for an identical column batch", "confidence": 75})
+            return [dict(m) for m in cached]  # Callers update the dicts in place
 
         try:
-            response = self._client.models.generate_content(
+            # Stream the reply so each mapping shows on the dashboard as soon
+            # as Gemini finishes it. Those decoded objects are the result.
+            buf, pos = "", None
+            mappings = []
+            for chunk in self._client.models.generate_content_stream(
                 model=Config.GEMINI_MODEL,
-                config=types.GenerateContentConfig(
-                    system_instruction=SYSTEM_INSTRUCTION,
-                    response_mime_type="application/json",
-                    response_schema=MAPPING_SCHEMA,
-                    temperature=0.1,
-                ),
+                config=self._gen_config,
                 contents=prompt,
-            )
-            data = json.loads(response.text)
-            return data.get("mappings", [])
-
+            ):
+                text = chunk.text
+                if not text:
+                    continue
+                buf += text
+                done, pos = _parse_new_mappings(buf, pos)
+                mappings.extend(done)
+                for m in done:
+                    emit_event("brain_thought", {
+                        "thought": f"Gemini mapped '{m.get('source_column')}' -> '{m.get('target_field')}'",
+                        "confidence": 75,
+                    })
+            # Only re-parse the whole reply if it isn't just the array of
+            # mappings seen above, closed off.
+            if pos is None or "".join(buf[pos:].split()) != "]}":
+                mappings = json.loads(buf).get("mappings", [])
+            _validate_mappings(mappings)
         except Exception as e:
             console.print(f"  [red]Gemini error: {e}[/red]")
             return self._mock_analyze(columns, target_schema)
 
+        self._response_cache[prompt] = [dict(m) for m in mappings]
+        while len(self._response_cache) > RESPONSE_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
+        return mappings
+
+    def _describe_target(self, target_schema: dict) -> tuple[list[str], str]:
+        """Return (field names, JSON field descriptions) for the prompt.
+
+        The pretty-printed description only changes with the schema, so it
+        is reused while the same fields dict keeps coming in.
+        """
+        fields = target_schema.get("fields", {})
+        cached = self._target_desc_cache
+        if cached is None or cached[0] is not fields:
+            cached = (fields, list(fields.keys()), json.dumps(fields, indent=2))
+            self._target_desc_cache = cached
+        return cached[1], cached[2]
+
     def _mock_analyze(self, columns: list[str], target_schema: dict) -> list[dict]:
         """Fallback mock analysis for demo mode."""
-        known_mappings = {
-            "cust_id": ("customer_id", "high"),
-            "customer_id": ("customer_id", "high"),
-            "cust_nm": ("full_name", "high"),
-            "full_name": ("full_name", "high"),
-            "cust_lvl_v2": ("subscription_tier", "low"),
-            "customer_level_ver2": ("subscription_tier", "high"),
-            "signup_dt": ("signup_date", "high"),
-            "registration_date": ("signup_date", "high"),
-            "email_addr": ("email", "high"),
-            "contact_email": ("email", "high"),
-            "phone_num": ("phone", "high"),
-            "mobile": ("phone", "high"),
-            "addr_line1": ("address", "high"),
-            "street_address": ("address", "high"),
-            "city_nm": ("city", "high"),
-            "city": ("city", "high"),
-            "st_cd": ("state", "high"),
-            "state_code": ("state", "high"),
-            "zip_cd": ("zip_code", "high"),
-            "postal_code": ("zip_code", "high"),
-            "dob": ("date_of_birth", "high"),
-            "date_of_birth": ("date_of_birth", "high"),
-            "acct_bal": ("account_balance", "high"),
-            "balance_usd": ("account_balance", "high"),
-            "last_login_ts": ("last_login", "high"),
-            "last_activity": ("last_login", "high"),
-            "is_active_flg": ("is_active", "high"),
-            "status": ("is_active", "high"),
-        }
-        results = []
-        for col in columns:
-            if col in known_mappings:
-                target, conf = known_mappings[col]
-                results.append({
-                    "source_column": col,
-                    "target_field": target,
-                    "confidence": conf,
-                    "reasoning": f"Pattern match: '{col}' -> '{target}'",
-                })
-            else:
-                results.append({
-                    "source_column": col,
-                    "target_field": "unknown",
-                    "confidence": "low",
-                    "reasoning": f"No known mapping for '{col}'",
-                })
-        return results
+        return [
+            {"source_column": col, **_KNOWN_RESULTS[col]} if col in _KNOWN_RESULTS
+            else {
+                "source_column": col,
+                "target_field": "unknown",
+                "confidence": "low",
+                "reasoning": f"No known mapping for '{col}'",
+            }
+            for col in columns
+        ]
@@ -7,7 +7,11 @@ when the API is unavailable.
 
 import csv
 import io
+import os
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
@@ -19,7 +23,18 @@ from server.events import emit_event
 console = Console()
 
 MAX_POLL_SECONDS = 180
-POLL_INTERVAL_SECS = 2.0
+POLL_INTERVAL_SECS = 2.0  # Longest wait between message polls
+POLL_INITIAL_SECS = 0.2  # First wait; doubles each poll up to POLL_INTERVAL_SECS
+SCRAPE_CACHE_TTL_SECS = 300  # How long a live portal scrape is reused
+CSV_CHECK_LINES = 5  # Header plus the data rows _looks_like_csv inspects
+
+_LEADING_SPACE = re.compile(r"\s*")
+
+_MOCK_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "mock")
+_MOCK_FILES = {
+    "Acme Corp": os.path.join(_MOCK_DATA_DIR, "client_a_acme.csv"),
+    "Globex Inc": os.path.join(_MOCK_DATA_DIR, "client_b_globex.csv"),
+}
 
 
 def _mk_session() -> requests.Session:
@@ -31,6 +46,22 @@ def _mk_session() -> requests.Session:
     return s
 
 
+def csv_row_dict(columns: list[str] | tuple[str, ...], row: list[str]) -> dict:
+    """Map one csv.reader row onto the header, exactly as csv.DictReader would.
+
+    Short rows get None for the missing columns; extra cells go in a list
+    under the None key.
+    """
+    d = dict(zip(columns, row))
+    n = len(columns)
+    if len(row) > n:
+        d[None] = row[n:]
+    elif len(row) < n:
+        for col in columns[len(row):]:
+            d[col] = None
+    return d
+
+
 DEFAULT_AGENT_NAME = "agi-0"
 
 
@@ -41,6 +72,8 @@ class BrowserAgent:
         self._session_id = None
         self._http = _mk_session()
         self._agent_name = DEFAULT_AGENT_NAME
+        # (client_name, portal_url) -> (monotonic time, parsed data) for live scrapes
+        self._scrape_cache: dict[tuple[str, str], tuple[float, dict]] = {}
 
     def scrape_client_data(self, client_name: str, portal_url: str, credentials: dict | None = None) -> dict:
         """Scrape CSV data from a client portal.
@@ -51,16 +84,30 @@ class BrowserAgent:
             credentials: Optional dict with "username" and "password" keys.
 
         Returns:
-            dict with keys: columns (list), rows (list of dicts), raw_csv (str)
+            dict with keys: columns (list), rows (list of dicts), raw_csv (str).
+            A live scrape is reused for SCRAPE_CACHE_TTL_SECS; don't mutate it.
         """
         if Config.DEMO_MODE:
             return self._mock_scrape(client_name)
 
+        key = (client_name, portal_url)
+        cached = self._scrape_cache.get(key)
+        age = time.monotonic() - cached[0] if cached else None
+        if age is not None and age < SCRAPE_CACHE_TTL_SECS:
+            console.print(f"  [cyan]AGI Browser:[/cyan] Reusing data scraped {age:.0f}s ago")
+            emit_event("browser_navigate", {"url": portal_url, "action": "Reusing recently scraped CSV..."})
+            return cached[1]
+
         try:
-            return self._agi_scrape(client_name, portal_url, credentials)
+            data = self._agi_scrape(client_name, portal_url, credentials)
         except Exception as e:
             console.print(f"  [yellow]AGI Browser failed: {e}. Using local fallback.[/yellow]")
             return self._mock_scrape(client_name)
+        if data is None:
+            console.print("  [yellow]AGI Browser: All methods failed, using local file.[/yellow]")
+            return self._mock_scrape(client_name)
+        self._scrape_cache[key] = (time.monotonic(), data)
+        return data
 
     def _build_headers(self) -> dict:
         """Build API headers matching the AGI reference client."""
@@ -114,11 +161,14 @@ class BrowserAgent:
         )
         resp.raise_for_status()
 
-        # Poll until the agent finishes this action
+        # Poll until the agent finishes this action. Most actions finish
+        # within a second or two, so start polling fast and back off.
         after_id = 0
+        delay = POLL_INITIAL_SECS
         deadline = time.time() + timeout_secs
         while time.time() < deadline:
-            time.sleep(POLL_INTERVAL_SECS)
+            time.sleep(delay)
+            delay = min(delay * 2, POLL_INTERVAL_SECS)
             try:
                 resp = self._http.get(
                     f"{Config.AGI_BASE_URL}/sessions/{self._session_id}/messages",
@@ -145,10 +195,11 @@ class BrowserAgent:
 
         return None
 
-    def _agi_scrape(self, client_name: str, portal_url: str, credentials: dict | None = None) -> dict:
+    def _agi_scrape(self, client_name: str, portal_url: str, credentials: dict | None = None) -> dict | None:
         """Use AGI Inc API to scrape data from a portal.
 
         Uses tightly-scoped single-action steps instead of one big prompt.
+        Returns None if neither the agent nor a direct download got the CSV.
         """
         headers = self._build_headers()
 
@@ -179,6 +230,13 @@ class BrowserAgent:
                 "action": "AGI Browser session started — watching live",
             })
 
+        # Fetch the direct-download fallbacks while the agent works, so they're
+        # ready if it can't extract the CSV. Own session: requests.Session
+        # isn't meant to be shared across threads.
+        prefetch = ThreadPoolExecutor(max_workers=1)
+        direct_download = prefetch.submit(self._direct_download, portal_url)
+        prefetch.shutdown(wait=False)
+
         # Step 2: Navigate to the portal login page
         emit_event("browser_navigate", {"url": portal_url, "action": "Navigating to portal..."})
         console.print(f"  [cyan]AGI Browser:[/cyan] Navigating to {portal_url}...")
@@ -235,42 +293,61 @@ class BrowserAgent:
         if csv_content:
             return self._parse_csv(csv_content)
 
-        # Fallback: download directly via localhost
+        # Fallback: the direct download started alongside the agent
         console.print("  [yellow]AGI Browser: Agent couldn't extract CSV, trying direct download...[/yellow]")
+        downloaded = direct_download.result()
+        if downloaded:
+            method, csv_content = downloaded
+            console.print(f"  [cyan]AGI Browser:[/cyan] {method} download succeeded")
+            return self._parse_csv(csv_content)
+
+        return None
+
+    def _direct_download(self, portal_url: str) -> tuple[str, str] | None:
+        """Fetch the portal's CSV without the agent: localhost first, then via ngrok.
+
+        Returns (method, csv text) for the first that works, else None.
+        """
+        http = _mk_session()
+        # Download directly via localhost
         try:
-            from urllib.parse import urlparse
             parsed = urlparse(portal_url)
             portal_path = parsed.path.rstrip("/")
             local_download_url = f"http://localhost:5001{portal_path}/download"
-            resp = self._http.get(local_download_url, timeout=10)
+            resp = http.get(local_download_url, timeout=10)
             if resp.status_code == 200 and self._looks_like_csv(resp.text):
-                console.print("  [cyan]AGI Browser:[/cyan] Local download succeeded")
-                return self._parse_csv(resp.text)
+                return "Local", resp.text
         except Exception:
             pass
 
-        # Fallback: try via ngrok with skip header
+        # Try via ngrok with skip header
         try:
             download_url = portal_url.rstrip("/") + "/download"
-            resp = self._http.get(
+            resp = http.get(
                 download_url,
                 headers={"ngrok-skip-browser-warning": "1"},
                 timeout=10,
             )
             if resp.status_code == 200 and self._looks_like_csv(resp.text):
-                console.print("  [cyan]AGI Browser:[/cyan] Direct download succeeded")
-                return self._parse_csv(resp.text)
+                return "Direct", resp.text
         except Exception:
             pass
-
-        # Fallback to local files
-        console.print("  [yellow]AGI Browser: All methods failed, using local file.[/yellow]")
-        return self._mock_scrape(client_name)
+        return None
 
     @staticmethod
     def _looks_like_csv(content: str) -> bool:
         """Check if content is actual CSV data, not conversational text."""
-        lines = content.strip().split("\n")
+        # Only the first few lines matter, so cut those out directly rather
+        # than stripping and splitting a whole (possibly large) reply.
+        start = _LEADING_SPACE.match(content).end()
+        lines = []
+        while len(lines) < CSV_CHECK_LINES:
+            end = content.find("\n", start)
+            if end < 0:
+                lines.append(content[start:])
+                break
+            lines.append(content[start:end])
+            start = end + 1
         if len(lines) < 2:
             return False
         # Header line must have 3+ comma-separated short fields
@@ -282,21 +359,12 @@ class BrowserAgent:
             return False
         # At least one data row must have the same number of commas as the header
         header_commas = lines[0].count(",")
-        return any(line.count(",") == header_commas for line in lines[1:5])
+        return any(line.count(",") == header_commas for line in lines[1:])
 
     def _mock_scrape(self, client_name: str) -> dict:
         """Load data from local mock CSV files."""
-        import os
-
-        file_map = {
-            "Acme Corp": "client_a_acme.csv",
-            "Globex Inc": "client_b_globex.csv",
-        }
         portal_key = "acme" if "Acme" in client_name else "globex"
-        filename = file_map.get(client_name, "client_a_acme.csv")
-        filepath = os.path.join(
-            os.path.dirname(os.path.dirname(__file__)), "data", "mock", filename
-        )
+        filepath = _MOCK_FILES.get(client_name, _MOCK_FILES["Acme Corp"])
 
         # Emit browser navigation events for the dashboard
         emit_event("browser_navigate", {
@@ -332,14 +400,26 @@ class BrowserAgent:
 
     def _parse_csv(self, raw_csv: str) -> dict:
         """Parse CSV string into structured data."""
-        reader = csv.DictReader(io.StringIO(raw_csv))
-        columns = reader.fieldnames or []
-        rows = list(reader)
-
-        # Build sample data (first 3 values per column)
-        sample_data = {}
-        for col in columns:
-            sample_data[col] = [row.get(col, "") for row in rows[:3]]
+        # csv.reader plus zip builds the same row dicts as csv.DictReader
+        # without its per-row Python overhead.
+        reader = csv.reader(io.StringIO(raw_csv))
+        columns = next(reader, [])
+        n = len(columns)
+        records = [row for row in reader if row]  # DictReader skips blank lines
+        rows = [
+            dict(zip(columns, row)) if len(row) == n else csv_row_dict(columns, row)
+            for row in records
+        ]
+
+        # Build sample data (first 3 values per column) by position from the
+        # parsed rows; a repeated header takes its last column, as in the row
+        # dicts. Ragged rows read their already-built dict instead.
+        positions = {col: i for i, col in enumerate(columns)}
+        head = list(zip(records[:3], rows))
+        sample_data = {
+            col: [record[i] if len(record) == n else row[col] for record, row in head]
+            for col, i in positions.items()
+        }
 
         console.print(
             f"  [cyan]AGI Browser:[/cyan] Scraped {len(rows)} rows, "
@@ -38,3 +38,7 @@ class Config:
     MEMORY_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "memory")
     CONFIDENCE_THRESHOLD = 0.75  # Below this, ask the human
     MEMORY_DISTANCE_THRESHOLD = 0.3  # Max vector distance for auto-match
+
+    HNSW_M = 16  # Graph degree of the memory HNSW index
+    HNSW_CONSTRUCTION_EF = 200  # Build-time candidate list size
+    HNSW_SEARCH_EF = 32  # Query-time candidate list size
@@ -6,24 +6,78 @@ previously-learned mappings before asking the human.
 """
 
 import os
+import threading
+from collections import OrderedDict
+
 import chromadb
+from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+from chromadb.utils.embedding_functions.onnx_mini_lm_l6_v2 import ONNXMiniLM_L6_V2
 from rich.console import Console
 
 from src.config import Config
 
 console = Console()
 
+MATCH_CACHE_SIZE = 1024  # find_match results kept per MemoryStore
+
+
+def _collection_metadata() -> dict:
+    """HNSW settings for the mappings collection (cosine space)."""
+    return {
+        "hnsw:space": "cosine",
+        "hnsw:M": Config.HNSW_M,
+        "hnsw:construction_ef": Config.HNSW_CONSTRUCTION_EF,
+        "hnsw:search_ef": Config.HNSW_SEARCH_EF,
+    }
+
+
+class _SharedModelEmbeddingFunction(DefaultEmbeddingFunction):
+    """Chroma's default embedder, keeping one loaded model per process.
+
+    The stock DefaultEmbeddingFunction builds a new ONNXMiniLM_L6_V2 on every
+    call, so each query and upsert reloads the ONNX session and tokenizer.
+    It keeps the "default" name, so persisted collections open unchanged.
+    """
+
+    _model: ONNXMiniLM_L6_V2 | None = None
+    _model_lock = threading.Lock()
+
+    def __call__(self, input):
+        cls = type(self)
+        if cls._model is None:
+            with cls._model_lock:
+                if cls._model is None:
+                    cls._model = ONNXMiniLM_L6_V2()
+        return cls._model(input)
+
+
+def _to_match(metadata: dict, distance: float) -> dict:
+    """Build a match dict from a query result's metadata and distance."""
+    return {
+        "source_column": metadata["source_column"],
+        "target_field": metadata["target_field"],
+        "client_name": metadata["client_name"],
+        "distance": distance,
+        "is_confident": distance <= Config.MEMORY_DISTANCE_THRESHOLD,
+    }
+
 
 class MemoryStore:
     """Persistent vector memory for learned data mappings."""
 
     def __init__(self):
+        # find_match results by column name (None = no confident match).
+        # Any write through this store can change a best match, so writes clear it.
+        self._match_cache: OrderedDict[str, dict | None] = OrderedDict()
+        self._match_cache_lock = threading.Lock()
+        self._writes = 0  # Bumped on every clear so in-flight lookups don't cache stale results
         os.makedirs(Config.MEMORY_DIR, exist_ok=True)
         self._client = chromadb.PersistentClient(path=Config.MEMORY_DIR)
         try:
             self._collection = self._client.get_or_create_collection(
                 name="column_mappings",
-                metadata={"hnsw:space": "cosine"},
+                metadata=_collection_metadata(),
+                embedding_function=_SharedModelEmbeddingFunction(),
             )
         except Exception:
             # Stale collection on disk — wipe and recreate
@@ -33,25 +87,47 @@ class MemoryStore:
                 pass
             self._collection = self._client.create_collection(
                 name="column_mappings",
-                metadata={"hnsw:space": "cosine"},
+                metadata=_collection_metadata(),
+                embedding_function=_SharedModelEmbeddingFunction(),
             )
 
     def store_mapping(self, source_column: str, target_field: str, client_name: str) -> None:
         """Store a learned mapping: source column name -> target schema field."""
-        doc_id = f"{client_name}_{source_column}"
+        self.store_mappings_bulk([(source_column, target_field, client_name)])
+
+    def store_mappings_bulk(self, items: list[tuple[str, str, str]], announce: bool = True) -> None:
+        """Store many (source_column, target_field, client_name) mappings at once.
+
+        Same effect as calling store_mapping() for each item in order, but all
+        embeddings and the index insert happen in a single upsert. Pass
+        announce=False to skip the per-mapping console lines (and print
+        them later with announce_stored()).
+        """
+        if not items:
+            return
+        # Later items win on a repeated id, as with sequential upserts
+        by_id = {f"{client_name}_{source_column}": (source_column, target_field, client_name)
+                 for source_column, target_field, client_name in items}
         self._collection.upsert(
-            ids=[doc_id],
-            documents=[source_column],
+            ids=list(by_id),
+            documents=[source_column for source_column, _, _ in by_id.values()],
             metadatas=[{
                 "source_column": source_column,
                 "target_field": target_field,
                 "client_name": client_name,
-            }],
-        )
-        console.print(
-            f"  [green]Memory stored:[/green] '{source_column}' -> '{target_field}' "
-            f"(from {client_name})"
+            } for source_column, target_field, client_name in by_id.values()],
         )
+        self._clear_match_cache()
+        if announce:
+            self.announce_stored(items)
+
+    def announce_stored(self, items: list[tuple[str, str, str]]) -> None:
+        """Print the console line for each stored (source_column, target_field, client_name)."""
+        for source_column, target_field, client_name in items:
+            console.print(
+                f"  [green]Memory stored:[/green] '{source_column}' -> '{target_field}' "
+                f"(from {client_name})"
+            )
 
     def lookup(self, column_name: str, n_results: int = 3) -> list[dict]:
         """Look up similar column names in memory.
@@ -59,43 +135,81 @@ class MemoryStore:
         Returns a list of matches with distance scores.
         Lower distance = better match (cosine distance).
         """
-        if self._collection.count() == 0:
+        count = self._collection.count()
+        if count == 0:
             return []
 
         results = self._collection.query(
             query_texts=[column_name],
-            n_results=min(n_results, self._collection.count()),
+            n_results=min(n_results, count),
+            include=["metadatas", "distances"],
         )
-
-        matches = []
-        for i in range(len(results["ids"][0])):
-            distance = results["distances"][0][i]
-            metadata = results["metadatas"][0][i]
-            matches.append({
-                "source_column": metadata["source_column"],
-                "target_field": metadata["target_field"],
-                "client_name": metadata["client_name"],
-                "distance": distance,
-                "is_confident": distance <= Config.MEMORY_DISTANCE_THRESHOLD,
-            })
-
-        return matches
+        return [
+            _to_match(metadata, distance)
+            for metadata, distance in zip(results["metadatas"][0], results["distances"][0])
+        ]
 
     def find_match(self, column_name: str) -> dict | None:
         """Find the best memory match for a column name.
 
         Returns the match if it's within the confidence threshold, else None.
         """
-        matches = self.lookup(column_name, n_results=1)
-        if matches and matches[0]["is_confident"]:
-            return matches[0]
-        return None
+        return self.find_matches_batch([column_name])[0]
+
+    def find_matches_batch(self, column_names: list[str]) -> list[dict | None]:
+        """Find the best memory match for each column name, in order.
+
+        Columns not already cached are embedded and searched in a single
+        ChromaDB query. Results (including misses) are cached until the next
+        write. The returned dicts are shared; don't mutate them.
+        """
+        found: dict[str, dict | None] = {}
+        with self._match_cache_lock:
+            for name in column_names:
+                if name in self._match_cache:
+                    self._match_cache.move_to_end(name)
+                    found[name] = self._match_cache[name]
+            writes = self._writes
+
+        misses = [name for name in dict.fromkeys(column_names) if name not in found]
+        if misses:
+            matches: list[dict | None] = [None] * len(misses)
+            if self._collection.count() > 0:
+                results = self._collection.query(
+                    query_texts=misses,
+                    n_results=1,
+                    include=["metadatas", "distances"],
+                )
+                for i, (metadatas, distances) in enumerate(zip(results["metadatas"], results["distances"])):
+                    if metadatas:
+                        match = _to_match(metadatas[0], distances[0])
+                        if match["is_confident"]:
+                            matches[i] = match
+            found.update(zip(misses, matches))
+
+            with self._match_cache_lock:
+                if writes == self._writes:
+                    for name, match in zip(misses, matches):
+                        self._match_cache[name] = match
+                    while len(self._match_cache) > MATCH_CACHE_SIZE:
+                        self._match_cache.popitem(last=False)
+
+        return [found[name] for name in column_names]
+
+    def _clear_match_cache(self) -> None:
+        with self._match_cache_lock:
+            self._writes += 1
+            self._match_cache.clear()
+
+    def warm_up(self) -> None:
+        """Load the embedding model now instead of on the first query or write."""
+        _SharedModelEmbeddingFunction()(["warm up"])
 
     def get_all_mappings(self) -> list[dict]:
         """Return all stored mappings."""
         if self._collection.count() == 0:
             return []
-        all_data = self._collection.get(include=["metadatas", "documents"])
+        all_data = self._collection.get(include=["metadatas"])
         mappings = []
         for i in range(len(all_data["ids"])):
             mappings.append({
@@ -110,9 +224,10 @@ class MemoryStore:
         # Remove all documents instead of deleting/recreating the collection
         # to avoid stale UUID references in ChromaDB's PersistentClient.
         if self._collection.count() > 0:
-            all_ids = self._collection.get()["ids"]
+            all_ids = self._collection.get(include=[])["ids"]
             if all_ids:
                 self._collection.delete(ids=all_ids)
+        self._clear_match_cache()
         console.print("  [yellow]Memory cleared.[/yellow]")
 
     @property
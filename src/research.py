@@ -4,6 +4,8 @@ Queries You.com Search API to find domain-specific context that helps
 the agent make better guesses about ambiguous column names.
 """
 
+import queue
+
 import requests
 from rich.console import Console
 
@@ -17,6 +19,19 @@ class ResearchEngine:
 
     def __init__(self):
         self._cache: dict[str, str] = {}
+        # Idle HTTP sessions, so repeat searches reuse connections. Brain runs
+        # searches from several threads and a requests.Session isn't meant to
+        # be shared across them, so each search checks one out for itself.
+        self._sessions: queue.SimpleQueue[requests.Session] = queue.SimpleQueue()
+
+    def _checkout_session(self) -> requests.Session:
+        """Take an idle session, or open a new one if all are in use."""
+        try:
+            return self._sessions.get_nowait()
+        except queue.Empty:
+            session = requests.Session()
+            session.headers.update({"X-API-Key": Config.YOU_API_KEY, "Accept": "application/json"})
+            return session
 
     def search(self, query: str) -> str:
         """Search You.com for context. Returns concatenated snippet text."""
@@ -27,13 +42,16 @@ class ResearchEngine:
         if Config.DEMO_MODE:
             return self._mock_search(query)
 
+        session = self._checkout_session()
         try:
-            response = requests.get(
-                Config.YOU_SEARCH_URL,
-                headers={"X-API-Key": Config.YOU_API_KEY, "Accept": "application/json"},
-                params={"query": query, "language": "EN"},
-                timeout=10,
-            )
+            try:
+                response = session.get(
+                    Config.YOU_SEARCH_URL,
+                    params={"query": query, "language": "EN"},
+                    timeout=10,
+                )
+            finally:
+                self._sessions.put(session)
             response.raise_for_status()
             data = response.json()
 
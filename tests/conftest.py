@@ -0,0 +1,16 @@
+"""Shared test setup: keep the vector store out of the source tree."""
+import os
+import pytest
+
+os.environ["DEMO_MODE"] = "true"
+
+from src.config import Config
+
+
+@pytest.fixture(autouse=True, scope="session")
+def isolated_memory_dir(tmp_path_factory):
+    """Point MemoryStore at a throwaway data/memory directory for the whole run."""
+    original = Config.MEMORY_DIR
+    Config.MEMORY_DIR = str(tmp_path_factory.mktemp("fde") / "data" / "memory")
+    yield Config.MEMORY_DIR
+    Config.MEMORY_DIR = original
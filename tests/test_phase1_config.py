@@ -28,6 +28,12 @@ class TestConfigValues:
         assert isinstance(Config.MEMORY_DISTANCE_THRESHOLD, float)
         assert 0 < Config.MEMORY_DISTANCE_THRESHOLD < 1
 
+    def test_hnsw_params_are_positive_ints(self):
+        """HNSW index parameters are positive integers."""
+        for value in (Config.HNSW_M, Config.HNSW_CONSTRUCTION_EF, Config.HNSW_SEARCH_EF):
+            assert isinstance(value, int)
+            assert value > 0
+
     def test_memory_dir_is_absolute_path(self):
         """MEMORY_DIR is an absolute path ending with data/memory."""
         assert os.path.isabs(Config.MEMORY_DIR)
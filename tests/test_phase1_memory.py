@@ -60,6 +60,33 @@ class TestMemoryStoreMappings:
         memory.store_mapping("email", "email", "Globex")
         assert memory.count == 2
 
+    def test_bulk_store_matches_sequential_upserts(self, memory):
+        """A bulk store inserts every item, and a repeated key keeps the last value."""
+        memory.store_mappings_bulk([
+            ("cust_id", "wrong_field", "Acme"),
+            ("email_addr", "email", "Acme"),
+            ("cust_id", "customer_id", "Acme"),
+        ])
+        assert memory.count == 2
+        assert memory.find_match("cust_id")["target_field"] == "customer_id"
+
+    def test_bulk_store_empty_is_noop(self, memory):
+        """Storing no items leaves memory untouched."""
+        memory.store_mappings_bulk([])
+        assert memory.count == 0
+
+
+class TestEmbeddingModel:
+    def test_model_loaded_once_per_process(self, memory):
+        """Queries and writes reuse the model loaded by warm_up()."""
+        from src.memory import _SharedModelEmbeddingFunction
+        memory.warm_up()
+        model = _SharedModelEmbeddingFunction._model
+        assert model is not None
+        memory.store_mapping("cust_id", "customer_id", "Acme")
+        memory.find_match("cust_id")
+        assert _SharedModelEmbeddingFunction._model is model
+
 
 class TestMemoryLookup:
     def test_lookup_empty_returns_empty(self, memory):
@@ -129,6 +156,35 @@ class TestMemoryFindMatch:
         # but we at least verify the function runs without error
         assert match is None or isinstance(match, dict)
 
+    def test_find_match_is_cached_until_next_write(self, memory):
+        """Repeated lookups reuse the cached result; storing a mapping invalidates it."""
+        assert memory.find_match("email_addr") is None
+        assert "email_addr" in memory._match_cache
+        memory.store_mapping("email_addr", "email", "Acme")
+        assert memory._match_cache == {}
+        first = memory.find_match("email_addr")
+        assert first["target_field"] == "email"
+        assert memory.find_match("email_addr") is first
+
+
+class TestMemoryFindMatchesBatch:
+    def test_batch_on_empty_returns_all_none(self, memory):
+        """Every column gets None when memory is empty."""
+        assert memory.find_matches_batch(["a", "b"]) == [None, None]
+
+    def test_batch_matches_single_lookups(self, memory):
+        """Batched results line up with the input order and agree with find_match."""
+        memory.store_mapping("email_addr", "email", "Acme")
+        memory.store_mapping("cust_id", "customer_id", "Acme")
+        columns = ["cust_id", "total_revenue_ytd_usd", "email_addr", "cust_id"]
+        batch = memory.find_matches_batch(columns)
+        assert len(batch) == 4
+        assert batch[0]["target_field"] == "customer_id"
+        assert batch[2]["target_field"] == "email"
+        assert batch[3] is batch[0]
+        memory._match_cache.clear()
+        assert [memory.find_match(c) for c in columns] == batch
+
 
 class TestMemoryGetAll:
     def test_get_all_empty(self, memory):
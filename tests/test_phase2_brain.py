@@ -118,6 +118,112 @@ class TestBrainMemoryIntegration:
         assert len(memory_results) == 1
         assert len(gemini_results) == 1
 
+    def test_memory_matches_keep_column_order(self, brain, target_schema):
+        """Concurrent memory lookups still report matches in input column order."""
+        columns = ["email_addr", "cust_id", "phone_num", "dob"]
+        for col, target in zip(columns, ["email", "customer_id", "phone", "date_of_birth"]):
+            brain._memory.store_mapping(col, target, "ClientA")
+        sample_data = {col: ["v1"] for col in columns}
+        results = brain.analyze_columns(columns, sample_data, target_schema)
+        assert [r["source_column"] for r in results] == columns
+        assert all(r["from_memory"] for r in results)
+
+
+class TestTargetDescription:
+    def test_description_reused_for_same_schema(self, brain, target_schema):
+        """The JSON field description is built once per schema."""
+        names, desc = brain._describe_target(target_schema)
+        assert names == list(target_schema["fields"])
+        assert json.loads(desc) == target_schema["fields"]
+        assert brain._describe_target(target_schema)[1] is desc
+
+    def test_description_rebuilt_for_new_schema(self, brain):
+        """A different schema replaces the cached description."""
+        names, _ = brain._describe_target({"fields": {"a": {"type": "string"}}})
+        assert names == ["a"]
+        names, _ = brain._describe_target({"fields": {"b": {"type": "string"}}})
+        assert names == ["b"]
+
+
+class TestStreamedMappings:
+    def test_mappings_released_as_they_complete(self):
+        """Each mapping object is returned once, as soon as its closing brace arrives."""
+        from src.brain import _parse_new_mappings
+        text = json.dumps({"mappings": [
+            {"source_column": "cust_id", "target_field": "customer_id", "confidence": "high", "reasoning": "a {b}"},
+            {"source_column": "dob", "target_field": "date_of_birth", "confidence": "high", "reasoning": "c"},
+        ]}, indent=2)
+        seen, pos = [], None
+        for end in range(1, len(text) + 1, 7):
+            done, pos = _parse_new_mappings(text[:end], pos)
+            seen.extend(done)
+        done, pos = _parse_new_mappings(text, pos)
+        seen.extend(done)
+        assert [m["source_column"] for m in seen] == ["cust_id", "dob"]
+
+    def test_streamed_objects_are_the_result(self, brain, target_schema, monkeypatch):
+        """A chunked reply yields its mappings; anything after the array is still parsed."""
+        from unittest.mock import MagicMock
+        from src.config import Config
+        monkeypatch.setattr(Config, "DEMO_MODE", False)
+        mapping = {"source_column": "dob", "target_field": "date_of_birth", "confidence": "high", "reasoning": "r"}
+        brain._client = MagicMock()
+        for reply in (json.dumps({"mappings": [mapping]}, indent=2),
+                      json.dumps({"mappings": [mapping], "note": "x"})):
+            chunks = [MagicMock(text=reply[i:i + 5]) for i in range(0, len(reply), 5)]
+            brain._client.models.generate_content_stream.return_value = chunks
+            assert brain._gemini_analyze(["dob"], {}, target_schema, reply) == [mapping]
+
+    def test_nothing_before_array_starts(self):
+        """No objects are reported until the mappings array has opened."""
+        from src.brain import _parse_new_mappings
+        assert _parse_new_mappings('{"mapp', None) == ([], None)
+
+
+class TestResponseCache:
+    def test_identical_batch_skips_gemini(self, brain, target_schema, monkeypatch):
+        """A repeated prompt is answered from the cache with fresh dicts."""
+        from unittest.mock import MagicMock
+        from src.config import Config
+        monkeypatch.setattr(Config, "DEMO_MODE", False)
+        reply = json.dumps({"mappings": [
+            {"source_column": "cust_id", "target_field": "customer_id", "confidence": "high", "reasoning": "r"},
+        ]})
+        brain._client = MagicMock()
+        brain._client.models.generate_content_stream.side_effect = lambda **kw: [MagicMock(text=reply)]
+        first = brain._gemini_analyze(["cust_id"], {"cust_id": ["1"]}, target_schema, "")
+        first[0]["confidence"] = "low"
+        second = brain._gemini_analyze(["cust_id"], {"cust_id": ["1"]}, target_schema, "")
+        assert brain._client.models.generate_content_stream.call_count == 1
+        assert second[0]["confidence"] == "high"
+
+    def test_different_samples_call_gemini(self, brain, target_schema, monkeypatch):
+        """Only an identical prompt is a hit."""
+        from unittest.mock import MagicMock
+        from src.config import Config
+        monkeypatch.setattr(Config, "DEMO_MODE", False)
+        brain._client = MagicMock()
+        brain._client.models.generate_content_stream.side_effect = lambda **kw: [MagicMock(text='{"mappings": []}')]
+        brain._gemini_analyze(["cust_id"], {"cust_id": ["1"]}, target_schema, "")
+        brain._gemini_analyze(["cust_id"], {"cust_id": ["2"]}, target_schema, "")
+        assert brain._client.models.generate_content_stream.call_count == 2
+
+
+class TestMappingValidation:
+    def test_valid_mappings_pass(self):
+        """Mappings matching MAPPING_SCHEMA are returned unchanged."""
+        from src.brain import _validate_mappings
+        mappings = [{"source_column": "dob", "target_field": "date_of_birth", "confidence": "medium", "reasoning": "r"}]
+        assert _validate_mappings(mappings) is mappings
+
+    def test_invalid_mappings_rejected(self):
+        """Missing fields or an unknown confidence raise ValueError."""
+        from src.brain import _validate_mappings
+        for bad in ({"mappings": []}, [{"source_column": "dob"}],
+                    [{"source_column": "dob", "target_field": "x", "confidence": "sure", "reasoning": "r"}]):
+            with pytest.raises(ValueError):
+                _validate_mappings(bad)
+
 
 class TestMockAnalyzer:
     def test_mock_handles_unknown_column(self, brain):
@@ -133,6 +239,20 @@ class TestMockAnalyzer:
         assert results[0]["target_field"] == "email"
         assert results[0]["confidence"] == "high"
 
+    def test_mock_results_are_fresh_dicts(self, brain):
+        """Editing a mock result (as the agent does) doesn't leak into later calls."""
+        first = brain._mock_analyze(["email_addr"], {})[0]
+        first["confidence"] = "low"
+        assert brain._mock_analyze(["email_addr"], {})[0]["confidence"] == "high"
+
+    def test_known_tables_are_read_only(self):
+        """The shared mock tables can't be edited by accident."""
+        from src.brain import _KNOWN_MAPPINGS, _KNOWN_RESULTS
+        with pytest.raises(TypeError):
+            _KNOWN_MAPPINGS["cust_id"] = ("email", "low")
+        with pytest.raises(TypeError):
+            _KNOWN_RESULTS["cust_id"]["confidence"] = "low"
+
     def test_mock_handles_mixed_columns(self, brain):
         """Mix of known and unknown columns."""
         results = brain._mock_analyze(["cust_id", "random_col"], {})
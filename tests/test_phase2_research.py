@@ -108,3 +108,42 @@ class TestResearchMockMode:
         r = ResearchEngine()
         r._mock_search("test cust_lvl query")
         assert any("cust_lvl" in key for key in r._cache)
+
+
+class TestResearchSessions:
+    def test_concurrent_searches_never_share_a_session(self, monkeypatch):
+        """Each in-flight search has its own session; idle ones are reused afterwards."""
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+        from unittest.mock import MagicMock
+        import src.research as research_module
+        from src.config import Config
+
+        monkeypatch.setattr(Config, "DEMO_MODE", False)
+        in_use, overlaps, created = set(), [], []
+        lock = threading.Lock()
+        barrier = threading.Barrier(3)
+
+        def make_session():
+            session = MagicMock()
+            def get(*args, **kwargs):
+                with lock:
+                    overlaps.append(session in in_use)
+                    in_use.add(session)
+                barrier.wait(timeout=2)
+                with lock:
+                    in_use.discard(session)
+                return MagicMock(json=lambda: {"results": {"web": []}})
+            session.get.side_effect = get
+            created.append(session)
+            return session
+
+        monkeypatch.setattr(research_module.requests, "Session", make_session)
+        r = ResearchEngine()
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            list(pool.map(r.search, ["q1", "q2", "q3"]))
+        assert len(created) == 3
+        assert not any(overlaps)
+        barrier = threading.Barrier(1)
+        r.search("q4")
+        assert len(created) == 3
@@ -120,9 +120,130 @@ class TestBrowserCSVParser:
         assert len(result["sample_data"]["x"]) == 3
         assert result["sample_data"]["x"] == ["1", "2", "3"]
 
+    def test_ragged_rows_match_dictreader(self):
+        """Short, long and blank rows come out exactly as csv.DictReader builds them."""
+        import csv
+        import io
+        b = BrowserAgent()
+        for raw in ("a,b,c\n1,2\n3,4,5,6\n\n7,8,9\n", "a,b,a\n1\n1,2\n"):
+            result = b._parse_csv(raw)
+            assert result["rows"] == list(csv.DictReader(io.StringIO(raw)))
+
+    def test_sample_data_matches_rows(self):
+        """Samples agree with the row dicts, including repeated headers and short rows."""
+        b = BrowserAgent()
+        raw = "a,b,a\n1,2,3\n4\n5,6,7,8\n9,10,11\n"
+        result = b._parse_csv(raw)
+        head = result["rows"][:3]
+        assert result["sample_data"] == {col: [row[col] for row in head] for col in ("a", "b")}
+        assert result["sample_data"]["a"] == ["3", None, "7"]
+
     def test_preserves_raw_csv(self):
         """raw_csv key contains the original CSV string unmodified."""
         b = BrowserAgent()
         raw = "col_a,col_b\nfoo,bar\n"
         result = b._parse_csv(raw)
         assert result["raw_csv"] == raw
+
+
+# ---------------------------------------------------------------------------
+# TestLooksLikeCSV -- _looks_like_csv unit tests
+# ---------------------------------------------------------------------------
+class TestLooksLikeCSV:
+    def test_accepts_csv_with_leading_whitespace(self):
+        """A CSV body is recognised even after blank lines; only the first rows are checked."""
+        body = "\n  cust_id,cust_nm,email_addr\n1,Ann,a@x.com\n" + "2,Bob\n" * 10000
+        assert BrowserAgent._looks_like_csv(body)
+
+    def test_rejects_conversational_text(self):
+        """Prose and header-only replies aren't treated as CSV."""
+        assert not BrowserAgent._looks_like_csv("I clicked the link, here it is: a, b, c")
+        assert not BrowserAgent._looks_like_csv("a,b,c\n\n\n")
+        assert not BrowserAgent._looks_like_csv("a,b,c\n1\n2\n3\n4\n1,2,3")
+
+
+# ---------------------------------------------------------------------------
+# TestAGIScrapeFallback -- live-path fallbacks with the AGI API mocked out
+# ---------------------------------------------------------------------------
+class TestAGIScrapeFallback:
+    def test_uses_prefetched_direct_download(self, monkeypatch):
+        """When the agent returns no CSV, the download fetched alongside it is used."""
+        from unittest.mock import MagicMock
+        b = BrowserAgent()
+        b._http = MagicMock()
+        b._http.post.return_value.json.return_value = {"session_id": "sess-12345678"}
+        monkeypatch.setattr(b, "_discover_agent", lambda headers: "agi-0")
+        monkeypatch.setattr(b, "_send_and_wait", lambda *a, **kw: None)
+        fetched = []
+        def fake_download(url):
+            fetched.append(url)
+            return "Local", "a,b,c\n1,2,3\n"
+        monkeypatch.setattr(b, "_direct_download", fake_download)
+        result = b._agi_scrape("Acme Corp", "https://portal.acme.com/data")
+        assert fetched == ["https://portal.acme.com/data"]
+        assert result["columns"] == ["a", "b", "c"]
+        assert result["rows"] == [{"a": "1", "b": "2", "c": "3"}]
+
+
+# ---------------------------------------------------------------------------
+# TestSendAndWait -- message polling with the AGI API mocked out
+# ---------------------------------------------------------------------------
+class TestSendAndWait:
+    def test_polls_fast_then_backs_off(self, monkeypatch):
+        """Poll waits start short and double up to POLL_INTERVAL_SECS."""
+        from unittest.mock import MagicMock
+        import src.browser as browser_module
+        sleeps = []
+        monkeypatch.setattr(browser_module.time, "sleep", sleeps.append)
+        b = BrowserAgent()
+        b._session_id = "sess-1"
+        b._http = MagicMock()
+        running = MagicMock(status_code=200)
+        running.json.return_value = {"messages": [], "status": "running"}
+        done = MagicMock(status_code=200)
+        done.json.return_value = {"messages": [], "status": "finished"}
+        b._http.get.side_effect = [running] * 5 + [done]
+        assert b._send_and_wait({}, "click it") is None
+        assert sleeps == [0.2, 0.4, 0.8, 1.6, 2.0, 2.0]
+
+
+# ---------------------------------------------------------------------------
+# TestScrapeCache -- live scrapes reused per (client, portal)
+# ---------------------------------------------------------------------------
+class TestScrapeCache:
+    @pytest.fixture
+    def live_browser(self, monkeypatch):
+        from src.config import Config
+        monkeypatch.setattr(Config, "DEMO_MODE", False)
+        b = BrowserAgent()
+        calls = []
+        def fake_scrape(client_name, portal_url, credentials=None):
+            calls.append((client_name, portal_url))
+            return {"columns": ["a"], "rows": [{"a": "1"}], "sample_data": {"a": ["1"]}, "raw_csv": "a\n1\n"}
+        monkeypatch.setattr(b, "_agi_scrape", fake_scrape)
+        b.calls = calls
+        return b
+
+    def test_repeat_scrape_reused(self, live_browser):
+        """A second scrape of the same portal within the TTL skips the agent."""
+        first = live_browser.scrape_client_data("Acme Corp", "https://portal.acme.com")
+        assert live_browser.scrape_client_data("Acme Corp", "https://portal.acme.com") is first
+        assert len(live_browser.calls) == 1
+        live_browser.scrape_client_data("Acme Corp", "https://other.acme.com")
+        assert len(live_browser.calls) == 2
+
+    def test_expired_scrape_rerun(self, live_browser, monkeypatch):
+        """After SCRAPE_CACHE_TTL_SECS the portal is scraped again."""
+        import src.browser as browser_module
+        live_browser.scrape_client_data("Acme Corp", "https://portal.acme.com")
+        now = browser_module.time.monotonic()
+        monkeypatch.setattr(browser_module.time, "monotonic", lambda: now + browser_module.SCRAPE_CACHE_TTL_SECS)
+        live_browser.scrape_client_data("Acme Corp", "https://portal.acme.com")
+        assert len(live_browser.calls) == 2
+
+    def test_local_fallback_not_cached(self, live_browser, monkeypatch):
+        """When the live scrape gets nothing, the local file is used and not kept."""
+        monkeypatch.setattr(live_browser, "_agi_scrape", lambda *a, **kw: None)
+        monkeypatch.setattr(live_browser, "_mock_scrape", lambda client_name: {"columns": []})
+        assert live_browser.scrape_client_data("Acme Corp", "https://portal.acme.com") == {"columns": []}
+        assert live_browser._scrape_cache == {}
@@ -49,6 +49,11 @@ class TestAgentInit:
         assert "customer_id" in agent.target_schema["fields"]
         assert "email" in agent.target_schema["fields"]
 
+    def test_target_schema_parsed_once(self):
+        """The default schema file is parsed once and shared until it changes."""
+        from src.agent import load_target_schema
+        assert load_target_schema() is load_target_schema()
+
     def test_memory_starts_empty_after_reset(self, agent):
         """After reset, memory count is 0."""
         assert agent.memory.count == 0
@@ -117,12 +122,51 @@ class TestContinualLearning:
         agent.onboard_client("Acme Corp", "https://portal.acmecorp.com/data")
         assert agent.memory.count > 0
 
+    def test_every_new_learning_is_persisted(self, agent):
+        """Mappings written during the phone call plus those confirmed on it all reach memory."""
+        summary = agent.onboard_client("Acme Corp", "https://portal.acmecorp.com/data")
+        assert summary["phone_calls"] == 1
+        assert agent.memory.count == summary["new_learnings"]
+
+    def test_every_new_learning_is_announced(self, agent, monkeypatch):
+        """Mappings written in the background during the call still get a 'Memory stored' line."""
+        from rich.console import Console
+        import src.memory as memory_module
+        term = Console(record=True, width=200)
+        monkeypatch.setattr(memory_module, "console", term)
+        summary = agent.onboard_client("Acme Corp", "https://portal.acmecorp.com/data")
+        assert summary["phone_calls"] == 1
+        assert term.export_text().count("Memory stored:") == summary["new_learnings"]
+
     def test_client_b_uses_memory(self, agent):
         """Client B should have from_memory > 0 after learning from Client A."""
         agent.onboard_client("Acme Corp", "https://portal.acmecorp.com/data")
         summary_b = agent.onboard_client("Globex Inc", "https://portal.globexinc.com/data")
         assert summary_b["from_memory"] > 0
 
+    def test_prewarm_caches_schema_fields_and_learned_columns(self, agent):
+        """Memory prewarm queries target fields and previously learned source columns."""
+        agent.memory.store_mapping("email_addr", "email", "Acme Corp")
+        agent._prewarm_memory(["email", "phone"])
+        assert {"email", "phone", "email_addr"} <= set(agent.memory._match_cache)
+
+    def test_prewarm_failure_is_logged(self, agent, monkeypatch):
+        """A failed warm-up doesn't raise, but leaves a note on the console."""
+        from rich.console import Console
+        import src.agent as agent_module
+        term = Console(record=True, width=200)
+        monkeypatch.setattr(agent_module, "console", term)
+        def failing_warm_up():
+            raise RuntimeError("model download failed")
+        monkeypatch.setattr(agent.memory, "warm_up", failing_warm_up)
+        agent._prewarm_memory(["email"])
+        assert "Memory warm-up failed: model download failed" in term.export_text()
+
+    def test_prewarm_skips_empty_memory(self, agent):
+        """Nothing is queried before anything has been learned."""
+        agent._prewarm_memory(["email"])
+        assert len(agent.memory._match_cache) == 0
+
 
 # ---------------------------------------------------------------------------
 # TestAgentSummary
@@ -172,6 +216,32 @@ class TestAgentReset:
         assert summary["from_memory"] == 0
 
 
+# ---------------------------------------------------------------------------
+# TestDisplay
+# ---------------------------------------------------------------------------
+
+class TestDisplay:
+    def test_tables_skipped_when_not_a_terminal(self, agent, capsys):
+        """Mapping and summary tables aren't rendered when stdout isn't a terminal."""
+        agent._display_mappings([("cust_id", "customer_id", "high", "Gemini AI")])
+        agent._display_summary({"client": "Acme Corp", "deployed": True})
+        assert capsys.readouterr().out == ""
+
+    def test_mapping_table_renders_rows(self, agent, monkeypatch):
+        """On a terminal, each collected row shows up in the mapping table."""
+        from rich.console import Console
+        import src.agent as agent_module
+        term = Console(force_terminal=True, width=120, record=True)
+        monkeypatch.setattr(agent_module, "console", term)
+        agent._display_mappings([
+            ("cust_id", "customer_id", "high", "Memory"),
+            ("cust_lvl_v2", "subscription_tier", "low", "Gemini AI"),
+        ])
+        text = term.export_text()
+        assert "cust_id" in text and "HIGH" in text
+        assert "cust_lvl_v2" in text and "LOW" in text
+
+
 # ---------------------------------------------------------------------------
 # TestDemoMode
 # ---------------------------------------------------------------------------
@@ -0,0 +1,396 @@
+"""Phase 7 tests: dashboard server routes -- demo control, portal, Plivo, SSE."""
+import os
+import threading
+from typing import ClassVar
+from unittest.mock import patch
+
+import pytest
+
+os.environ["DEMO_MODE"] = "true"
+
+from server import webhooks
+from server.webhooks import app
+
+
+@pytest.fixture
+def client():
+    app.config["TESTING"] = True
+    with app.test_client() as c:
+        yield c
+
+
+@pytest.fixture
+def blocked_demo():
+    """Replace the demo worker with one that blocks until released."""
+    release = threading.Event()
+
+    def fake_run(config=None):
+        try:
+            release.wait(timeout=5)
+        finally:
+            webhooks._demo_lock.release()
+
+    with patch.object(webhooks, "_run_demo_background", side_effect=fake_run):
+        yield release
+    release.set()
+
+
+class TestDemoControl:
+    def test_status_idle(self, client):
+        """/demo/status reports not running when idle."""
+        resp = client.get("/demo/status")
+        assert resp.status_code == 200
+        assert resp.get_json() == {"running": False}
+
+    def test_start_then_reject_overlap(self, client, blocked_demo):
+        """A second /demo/start while one is running returns 409."""
+        first = client.post("/demo/start", json={})
+        assert first.status_code == 200
+        assert first.get_json()["status"] == "started"
+
+        second = client.post("/demo/start", json={})
+        assert second.status_code == 409
+        assert client.get("/demo/status").get_json()["running"] is True
+
+        blocked_demo.set()
+        for _ in range(50):
+            if not client.get("/demo/status").get_json()["running"]:
+                break
+            threading.Event().wait(0.05)
+        assert client.get("/demo/status").get_json()["running"] is False
+
+    def test_failed_thread_start_clears_flag(self, client):
+        """If the worker thread cannot start, the running flag is reset."""
+        with (
+            patch.object(threading.Thread, "start", side_effect=RuntimeError("no threads")),
+            pytest.raises(RuntimeError),
+        ):
+            client.post("/demo/start", json={})
+        assert client.get("/demo/status").get_json()["running"] is False
+
+
+class TestPortalCSVCache:
+    def test_load_csv_reuses_parsed_rows(self):
+        """Repeated loads return the same cached, immutable rows."""
+        _, columns, rows_1, row_count = webhooks._load_csv("acme")
+        _, _, rows_2, _ = webhooks._load_csv("acme")
+        assert rows_1 is rows_2
+        assert len(rows_1) == row_count == 5
+        assert isinstance(columns, tuple)
+        assert isinstance(rows_1, tuple)
+
+    def test_load_csv_reparses_on_mtime_change(self):
+        """A changed mtime invalidates the cached parse."""
+        _, _, rows_1, _ = webhooks._load_csv("acme")
+        path = webhooks._csv_path("acme")
+        st = os.stat(path)
+        try:
+            os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+            mtime, _, rows_2, _ = webhooks._load_csv("acme")
+            assert mtime == st.st_mtime_ns + 1_000_000
+            assert rows_2 is not rows_1
+            assert rows_2 == rows_1
+        finally:
+            os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    def test_dashboard_keyed_on_mtime_of_rendered_rows(self, client):
+        """The cached page is stored under the mtime its rows were parsed at, even if the cache moves on."""
+        webhooks._dashboard_html.pop("acme", None)
+        snapshot = webhooks._load_csv("acme")
+        newer = (snapshot[0] + 1,) + snapshot[1:]
+
+        def load_then_reparse(client_key):
+            webhooks._csv_cache[client_key] = newer  # Another thread re-parses meanwhile
+            return snapshot
+
+        try:
+            with patch.object(webhooks, "_load_csv", side_effect=load_then_reparse):
+                webhooks._render_portal_dashboard("acme")
+            assert webhooks._dashboard_html["acme"][0] == snapshot[0]
+        finally:
+            webhooks._csv_cache.pop("acme", None)
+            webhooks._dashboard_html.pop("acme", None)
+
+    def test_unknown_client_returns_empty(self):
+        """Unknown portal keys load as empty data."""
+        assert webhooks._load_csv("nope") == (0, (), (), 0)
+
+    def test_ragged_rows_match_dictreader(self, tmp_path):
+        """Short and long rows come out exactly as csv.DictReader builds them."""
+        import csv
+        import io
+        raw = "a,b,a,c\n1\n1,2,3,4,5\n\n1,2,3,4\n"
+        path = tmp_path / "ragged.csv"
+        path.write_text(raw)
+        try:
+            with patch.dict(webhooks._CSV_PATHS, {"ragged": str(path)}):
+                _, columns, rows, row_count = webhooks._load_csv("ragged")
+            assert columns == ("a", "b", "a", "c")
+            assert list(rows) == list(csv.DictReader(io.StringIO(raw)))
+            assert rows[0] == {"a": None, "b": None, "c": None}
+            assert row_count == 3
+        finally:
+            webhooks._csv_cache.pop("ragged", None)
+
+    def test_rows_beyond_limit_are_only_counted(self, client):
+        """Past _DASHBOARD_MAX_ROWS, records are counted but not kept or rendered."""
+        webhooks._csv_cache.pop("acme", None)
+        webhooks._dashboard_html.pop("acme", None)
+        try:
+            with patch.object(webhooks, "_DASHBOARD_MAX_ROWS", 2):
+                _, _, rows, row_count = webhooks._load_csv("acme")
+                html = client.get("/portal/acme/dashboard").data
+            assert len(rows) == 2
+            assert row_count == 5
+            assert b"Showing 2 of 5 records" in html
+        finally:
+            webhooks._csv_cache.pop("acme", None)
+            webhooks._dashboard_html.pop("acme", None)
+
+
+class TestPortalRoutes:
+    def test_dashboard_renders_rows(self, client):
+        """The portal dashboard lists the CSV columns and rows."""
+        resp = client.get("/portal/acme/dashboard")
+        assert resp.status_code == 200
+        assert resp.mimetype == "text/html"
+        html = resp.data.decode()
+        assert "Acme Corp" in html
+        assert "cust_lvl_v2" in html
+        assert "Showing 5 records" in html
+
+    def test_login_page_renders_client(self, client):
+        """The portal login page is branded for the requested client."""
+        resp = client.get("/portal/globex")
+        assert resp.status_code == 200
+        assert resp.mimetype == "text/html"
+        assert b"Globex Inc" in resp.data
+        assert b'action="/portal/globex"' in resp.data
+
+    def test_static_pages_are_prerendered(self, client):
+        """Login, landing and demo dashboard pages are served from bytes with a short public cache."""
+        for path, html in (
+            ("/portal/acme", webhooks._PORTAL_LOGIN_HTML["acme"]),
+            ("/", webhooks._LANDING_HTML),
+            ("/dashboard", webhooks._DASHBOARD_HTML),
+        ):
+            resp = client.get(path)
+            assert resp.status_code == 200
+            assert resp.data == html
+            assert resp.cache_control.public
+            assert resp.cache_control.max_age == 60
+
+    def test_dashboard_unknown_client_404(self, client):
+        """Unknown portal keys return 404."""
+        assert client.get("/portal/nope/dashboard").status_code == 404
+
+    def test_every_portal_route_404s_unknown_client(self, client):
+        """Login, submit, dashboard and download all reject unknown portal keys."""
+        assert client.get("/portal/nope").status_code == 404
+        assert client.post("/portal/nope").status_code == 404
+        assert client.get("/portal/nope/download").status_code == 404
+
+    def test_dashboard_html_is_cached(self, client):
+        """A second request reuses the rendered page."""
+        client.get("/portal/globex/dashboard")
+        cached = webhooks._dashboard_html["globex"][1]
+        resp = client.get("/portal/globex/dashboard")
+        assert resp.data == cached
+        assert webhooks._dashboard_html["globex"][1] is cached
+
+    def test_dashboard_supports_conditional_get(self, client):
+        """The dashboard page carries an ETag and honours If-None-Match."""
+        first = client.get("/portal/acme/dashboard")
+        etag = first.headers["ETag"]
+        resp = client.get("/portal/acme/dashboard", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.data == b""
+
+    def test_download_returns_csv_attachment(self, client):
+        """The download route serves the raw CSV as an attachment."""
+        resp = client.get("/portal/acme/download")
+        assert resp.status_code == 200
+        assert resp.mimetype == "text/csv"
+        assert "acme_data.csv" in resp.headers["Content-Disposition"]
+        assert resp.data.decode().startswith("cust_id,")
+        resp.close()
+
+    def test_download_does_not_parse_csv(self, client):
+        """The download streams the file without going through the CSV parser."""
+        with patch.object(webhooks, "_load_csv", side_effect=AssertionError("parsed")):
+            resp = client.get("/portal/globex/download")
+        assert resp.status_code == 200
+        assert resp.data.decode().startswith("customer_id,")
+        resp.close()
+
+    def test_download_gzip_when_accepted(self, client):
+        """Clients that accept gzip get a compressed copy of the same CSV."""
+        import gzip
+        plain = client.get("/portal/acme/download")
+        raw = plain.data
+        plain.close()
+        resp = client.get("/portal/acme/download", headers={"Accept-Encoding": "gzip"})
+        assert resp.status_code == 200
+        assert resp.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in resp.headers["Vary"]
+        assert "acme_data.csv" in resp.headers["Content-Disposition"]
+        assert gzip.decompress(resp.data) == raw
+
+        etag = resp.headers["ETag"]
+        again = client.get(
+            "/portal/acme/download",
+            headers={"Accept-Encoding": "gzip", "If-None-Match": etag},
+        )
+        assert again.status_code == 304
+
+    def test_large_download_streams_uncompressed(self, client):
+        """CSVs above the gzip size cap are streamed from disk as-is."""
+        with patch.object(webhooks, "_GZIP_MAX_BYTES", 10):
+            resp = client.get("/portal/acme/download", headers={"Accept-Encoding": "gzip"})
+        assert resp.status_code == 200
+        assert "Content-Encoding" not in resp.headers
+        assert resp.data.decode().startswith("cust_id,")
+        resp.close()
+
+    def test_download_supports_conditional_get(self, client):
+        """Re-requesting with the returned ETag yields 304 Not Modified."""
+        first = client.get("/portal/acme/download")
+        etag = first.headers["ETag"]
+        first.close()
+        resp = client.get("/portal/acme/download", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.data == b""
+
+
+class TestPlivoInputXML:
+    @pytest.fixture
+    def session(self):
+        from src.teacher import MappingQuestion, create_call_session
+        create_call_session(
+            "xml-test",
+            [MappingQuestion("cust_<id>", "customer_id"), MappingQuestion("mail", "email")],
+            ["customer_id", "email"],
+        )
+        return "xml-test"
+
+    def test_confirm_redirects_to_next_question(self, client, session):
+        """Confirming a middle question speaks an ack then redirects."""
+        resp = client.post(f"/plivo/input?session_id={session}&index=0", data={"Digits": "1"})
+        xml = resp.data.decode()
+        assert "<Speak>Got it. Confirmed: cust_&lt;id&gt; maps to customer_id.</Speak>" in xml
+        assert "index=1&amp;retry=0</Redirect>" in xml
+
+    def test_last_question_says_goodbye(self, client, session):
+        """Answering the final question ends the call instead of redirecting."""
+        resp = client.post(f"/plivo/input?session_id={session}&index=1", data={"Digits": "2"})
+        xml = resp.data.decode()
+        assert "<Speak>Understood. I will skip the mapping for mail.</Speak>" in xml
+        assert xml.endswith(f"<Speak>{webhooks._GOODBYE_TEXT}</Speak>\n</Response>\n")
+        assert "<Redirect>" not in xml
+
+    def test_key_press_ignores_speech_fields(self, client, session):
+        """A DTMF answer is recorded without parsing Speech or Confidence."""
+        from src.teacher import get_call_session
+        resp = client.post(
+            f"/plivo/input?session_id={session}&index=0",
+            data={"Digits": "2", "Speech": "yes", "Confidence": "n/a"},
+        )
+        assert resp.status_code == 200
+        assert "I will skip the mapping" in resp.data.decode()
+        assert get_call_session(session).questions[0].response == "rejected"
+
+    def test_callback_urls_are_query_encoded(self, client):
+        """Session ids are percent-encoded in the callback URLs."""
+        from src.teacher import MappingQuestion, create_call_session
+        create_call_session("a&b c", [MappingQuestion("mail", "email")], ["email"])
+        resp = client.get("/plivo/answer", query_string={"session_id": "a&b c", "index": "0"})
+        xml = resp.data.decode()
+        assert 'action="http://localhost/plivo/input?session_id=a%26b+c&amp;index=0&amp;retry=0"' in xml
+
+    def test_handlers_do_not_build_plivoxml_trees(self, client, session):
+        """Responses come from the import-time templates, not per-request elements."""
+        with patch.object(webhooks.plivoxml, "ResponseElement", side_effect=AssertionError("built")):
+            assert client.get(f"/plivo/answer?session_id={session}&index=0").status_code == 200
+            assert client.post(f"/plivo/input?session_id={session}&index=0", data={"Digits": "1"}).status_code == 200
+            assert client.post(f"/plivo/input?session_id={session}&index=1", data={"Speech": "hmm"}).status_code == 200
+
+
+class TestSpeechFieldMatching:
+    FIELDS: ClassVar[list[str]] = ["email", "email_address", "phone", "zip_code"]
+
+    def test_spoken_underscore_matches_field(self):
+        """'email address' resolves to the email_address field."""
+        assert webhooks._extract_field_from_speech("email address", self.FIELDS) == "email_address"
+
+    def test_correction_phrase_and_filler_words(self):
+        """Correction phrases and filler words are stripped before matching."""
+        assert webhooks._extract_field_from_speech("no, it's the zip code field", self.FIELDS) == "zip_code"
+
+    def test_earliest_exact_match_wins(self):
+        """When two fields normalize to the spoken text, the first listed wins."""
+        fields = ["Zip_Code", "zip_code"]
+        assert webhooks._extract_field_from_speech("zip code", fields) == "Zip_Code"
+        assert webhooks._extract_field_from_speech("zip_code", fields) == "Zip_Code"
+
+    def test_contained_field_beats_earlier_partial_match(self):
+        """A field named inside the speech outranks an earlier field that merely contains it."""
+        fields = ["phone_number", "phone"]
+        assert webhooks._extract_field_from_speech("phone n", fields) == "phone"
+        assert webhooks._extract_field_from_speech("phone num", ["phone_number", "email"]) == "phone_number"
+
+    def test_field_index_is_cached(self):
+        """The normalized field table is built once per field list."""
+        webhooks._field_index.cache_clear()
+        webhooks._extract_field_from_speech("phone", self.FIELDS)
+        webhooks._extract_field_from_speech("email", self.FIELDS)
+        info = webhooks._field_index.cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
+
+
+class TestDashboardEvents:
+    def test_stream_replays_history(self, client):
+        """A new SSE client gets the connect comment, then the history in one chunk."""
+        from server.events import emit_event, format_sse, get_history, reset
+
+        reset()
+        emit_event("step_start", {"step": "scrape"})
+        emit_event("step_complete", {"step": "scrape"})
+        resp = client.get("/dashboard/events")
+        try:
+            assert resp.mimetype == "text/event-stream"
+            chunks = iter(resp.response)
+            assert next(chunks) == b": connected\n\n"
+            assert next(chunks) == b"".join(format_sse(e).encode() for e in get_history())
+        finally:
+            resp.close()
+            reset()
+
+    def test_slot_taken_on_request_and_released_on_close(self, client):
+        """The subscriber slot is held from the request until the response closes."""
+        from server.events import subscriber_count
+
+        before = subscriber_count()
+        resp = client.get("/dashboard/events")
+        assert subscriber_count() == before + 1
+        resp.close()  # Never iterated: the slot is still released
+        assert subscriber_count() == before
+
+    def test_full_server_tells_client_to_retry(self, client):
+        """At the cap, the client gets a 200 stream with a retry field, not an error."""
+        from server.events import subscribe, subscriber_count, unsubscribe
+
+        held = 0
+        while subscribe(limit=webhooks._SSE_MAX_CLIENTS) is not None:
+            held += 1
+        try:
+            resp = client.get("/dashboard/events")
+            assert resp.status_code == 200
+            assert resp.mimetype == "text/event-stream"
+            retry = [line for line in resp.get_data().split(b"\n") if line.startswith(b"retry: ")]
+            assert int(retry[0].split()[1]) > webhooks._SSE_KEEPALIVE_SECS * 1000
+            resp.close()
+            assert subscriber_count() == webhooks._SSE_MAX_CLIENTS
+        finally:
+            for _ in range(held):
+                unsubscribe()
@@ -0,0 +1,172 @@
+"""Phase 7 tests: server.events -- dashboard event bus and SSE formatting."""
+import os
+import threading
+import time
+import pytest
+
+os.environ["DEMO_MODE"] = "true"
+
+from server import events
+from server.events import (
+    emit_event, emit_events_batch, get_history, subscribe, unsubscribe, read_events, reset, format_sse,
+    subscriber_count,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_history():
+    """Start and end each test with an empty event history."""
+    reset()
+    yield
+    reset()
+
+
+class TestEventHistory:
+    def test_emit_appends_to_history(self):
+        """Emitted events are replayable via get_history()."""
+        emit_event("step_start", {"step": "scrape"})
+        history = get_history()
+        assert len(history) == 1
+        assert history[0]["type"] == "step_start"
+        assert history[0]["data"] == {"step": "scrape"}
+
+    def test_batch_emit_keeps_order(self):
+        """A batch lands in history in order, the same as individual emits."""
+        emit_events_batch([("memory_recall", {"source": "a"}), ("mapping_result", None)])
+        history = get_history()
+        assert [e["type"] for e in history] == ["memory_recall", "mapping_result"]
+        assert history[1]["data"] == {}
+
+    def test_batch_emit_wakes_reader_once(self):
+        """A waiting reader gets the whole batch from a single read."""
+        cursor = subscribe()
+        try:
+            timer = threading.Timer(0.05, emit_events_batch, args=([("a", {}), ("b", {}), ("c", {})],))
+            timer.start()
+            cursor, payloads = read_events(cursor, timeout=2)
+            timer.join()
+            assert len(payloads) == 3
+        finally:
+            unsubscribe()
+
+    def test_history_is_bounded(self):
+        """Only the most recent MAX_HISTORY events are retained."""
+        for i in range(events.MAX_HISTORY + 10):
+            emit_event("tick", {"i": i})
+        history = get_history()
+        assert len(history) == events.MAX_HISTORY
+        assert history[0]["data"]["i"] == 10
+        assert history[-1]["data"]["i"] == events.MAX_HISTORY + 9
+
+    def test_reset_clears_history(self):
+        """reset() empties the replay buffer."""
+        emit_event("tick")
+        reset()
+        assert get_history() == []
+
+    def test_read_after_reset_waits(self):
+        """A cursor left behind by reset() catches up and waits instead of spinning."""
+        emit_event("tick")
+        reset()
+        start = time.monotonic()
+        cursor, payloads = read_events(0, timeout=0.2)
+        assert payloads == []
+        assert time.monotonic() - start >= 0.2
+        assert cursor == events._last_id
+        emit_event("tick", {"i": 2})
+        assert read_events(cursor)[1] == [format_sse(get_history()[-1]).encode()]
+
+    def test_reset_keeps_cursors_valid(self):
+        """A subscriber's cursor still sees events emitted after reset()."""
+        emit_event("tick", {"i": 1})
+        cursor, _ = read_events(subscribe())
+        try:
+            reset()
+            emit_event("tick", {"i": 2})
+            _, payloads = read_events(cursor)
+            assert payloads == [format_sse(get_history()[-1]).encode()]
+        finally:
+            unsubscribe()
+
+
+class TestSubscribers:
+    def test_new_subscriber_replays_history(self):
+        """A fresh cursor reads every retained event as encoded SSE frames."""
+        emit_event("step_start", {"step": "scrape"})
+        emit_event("step_complete", {"step": "scrape"})
+        cursor = subscribe()
+        try:
+            cursor, payloads = read_events(cursor)
+            assert payloads == [format_sse(e).encode() for e in get_history()]
+            assert read_events(cursor) == (cursor, [])
+        finally:
+            unsubscribe()
+
+    def test_subscriber_receives_sse_payload(self):
+        """A waiting reader wakes up with the pre-encoded SSE message."""
+        cursor = subscribe()
+        try:
+            threading.Timer(0.05, emit_event, args=("phase_start", {"phase": 1})).start()
+            _, payloads = read_events(cursor, timeout=2)
+            assert len(payloads) == 1
+            assert payloads[0].startswith(b"data: ")
+            assert payloads[0].endswith(b"\n\n")
+            assert payloads[0] == format_sse(get_history()[-1]).encode()
+        finally:
+            unsubscribe()
+
+    def test_read_times_out_empty(self):
+        """With nothing new, read_events returns an empty list after the timeout."""
+        cursor = subscribe()
+        try:
+            assert read_events(cursor, timeout=0.01) == (cursor, [])
+        finally:
+            unsubscribe()
+
+    def test_subscribers_share_one_payload(self):
+        """Every subscriber gets the same bytes object for an event."""
+        c1, c2 = subscribe(), subscribe()
+        try:
+            emit_event("tick")
+            assert read_events(c1)[1][0] is read_events(c2)[1][0]
+        finally:
+            unsubscribe()
+            unsubscribe()
+
+    def test_subscribe_refuses_at_limit(self):
+        """With a limit, subscribe() returns None once that many are registered."""
+        base = subscriber_count()
+        cursor = subscribe(limit=base + 1)
+        try:
+            assert cursor is not None
+            assert subscribe(limit=base + 1) is None
+            assert subscriber_count() == base + 1
+        finally:
+            unsubscribe()
+
+    def test_subscriber_count_tracks_subscriptions(self):
+        """subscriber_count() reflects subscribe/unsubscribe calls."""
+        before = subscriber_count()
+        subscribe()
+        assert subscriber_count() == before + 1
+        unsubscribe()
+        assert subscriber_count() == before
+
+    def test_lagging_reader_resumes_at_oldest_retained(self):
+        """A reader more than MAX_HISTORY events behind skips to the ring's start."""
+        cursor = subscribe()
+        try:
+            for i in range(events.MAX_HISTORY + 5):
+                emit_event("tick", {"i": i})
+            _, payloads = read_events(cursor)
+            assert len(payloads) == events.MAX_HISTORY
+            assert payloads[0] == format_sse(get_history()[0]).encode()
+        finally:
+            unsubscribe()
+
+
+class TestFormatSSE:
+    def test_compact_json(self):
+        """SSE frames use compact JSON separators."""
+        payload = format_sse({"type": "x", "data": {"a": 1}})
+        assert payload == 'data: {"type":"x","data":{"a":1}}\n\n'